@@ -5,7 +5,9 @@ Registration is automatic via CheckRegistry.register().
 """
 import time
 from abc import ABC, abstractmethod
+from agents.net.page_store import BotProtectionBlocked, current_check
 from core.models import CheckResult, CheckStatus, RunContext, Severity
+from utils.signatures import signature_catalog
 
 
 class BaseCheck(ABC):
@@ -16,6 +18,7 @@ class BaseCheck(ABC):
     platforms: list[str] = ["universal"]
     severity: Severity = Severity.major
     tier: int = 1  # 1=sync, 2=async I/O, 3=platform API
+    uses_signatures: bool = False  # reads the tracking signature catalog (utils/signatures.py)
 
     @abstractmethod
     def execute(self, ctx: RunContext) -> CheckResult:
@@ -48,15 +51,38 @@ class BaseCheck(ABC):
     def run(self, ctx: RunContext) -> CheckResult:
         """Wrapper that times execution and catches all exceptions."""
         start = time.monotonic()
+        token = current_check.set(self.check_id)
         try:
             result = self.execute(ctx)
+        except BotProtectionBlocked as exc:
+            result = self._result(
+                status=CheckStatus.skipped,
+                message=str(exc),
+                recommendation=(
+                    "The landing page served a bot challenge instead of its content. "
+                    "Verify this check manually, or allowlist the LaunchProof crawler in your CDN/WAF."
+                ),
+                metadata={"bot_protection": exc.vendors},
+            )
         except Exception as exc:
             result = self._result(
                 status=CheckStatus.error,
                 message=f"Check error: {exc}",
                 execution_ms=int((time.monotonic() - start) * 1000),
             )
+        finally:
+            current_check.reset(token)
         result.execution_ms = int((time.monotonic() - start) * 1000)
+        # Which landing pages were served from the cross-run cache, and which were bot challenges
+        if ctx._page_store is not None:
+            if sources := ctx._page_store.sources(self.check_id):
+                result.metadata.setdefault("page_sources", sources)
+            if blocked := ctx._page_store.blocked(self.check_id):
+                result.metadata.setdefault("bot_protection", blocked)
+        if self.uses_signatures:
+            result.metadata.setdefault("signature_catalog", signature_catalog().version)
+            if ctx._page_store is not None and (inventory := ctx._page_store.vendor_inventory(self.check_id)):
+                result.metadata.setdefault("vendor_inventory", inventory)
         return result
 
 
@@ -3,60 +3,10 @@ Tier 2 Open Graph / Social Preview Checks.
 Fetches landing pages and verifies og:title, og:image, og:description are present.
 Missing OG tags = broken social previews when ads link to the page.
 """
-import asyncio
-import re
 from agents.checks.base import BaseCheck, CheckRegistry
+from agents.net.page_store import get_page_store
 from core.models import CheckResult, CheckStatus, RunContext, Severity
 
-_OG_TITLE_RE = re.compile(r'<meta[^>]+property=["\']og:title["\'][^>]+content=["\']([^"\']+)', re.IGNORECASE)
-_OG_IMAGE_RE = re.compile(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)', re.IGNORECASE)
-_OG_DESC_RE = re.compile(r'<meta[^>]+property=["\']og:description["\'][^>]+content=["\']([^"\']+)', re.IGNORECASE)
-# Also match reversed attribute order (content before property)
-_OG_TITLE_RE2 = re.compile(r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:title', re.IGNORECASE)
-_OG_IMAGE_RE2 = re.compile(r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image', re.IGNORECASE)
-_OG_DESC_RE2 = re.compile(r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:description', re.IGNORECASE)
-
-
-def _has_og(html: str, *patterns) -> bool:
-    return any(p.search(html) for p in patterns)
-
-
-async def _fetch_head(url: str, timeout: int = 10) -> dict:
-    """Fetch first 50KB of HTML (enough to capture <head> tags)."""
-    import httpx
-    try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; LaunchProof/1.0)"},
-        ) as client:
-            async with client.stream("GET", url) as resp:
-                if resp.status_code >= 400:
-                    return {"url": url, "error": f"HTTP {resp.status_code}", "html": ""}
-                chunks = []
-                size = 0
-                async for chunk in resp.aiter_bytes(4096):
-                    chunks.append(chunk)
-                    size += len(chunk)
-                    if size >= 50_000:
-                        break
-                html = b"".join(chunks).decode("utf-8", errors="replace")
-                return {"url": url, "html": html}
-    except Exception as exc:
-        return {"url": url, "error": str(exc), "html": ""}
-
-
-def _run_async(coro):
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                return pool.submit(asyncio.run, coro).result(timeout=60)
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
-
 
 class OpenGraphTagsCheck(BaseCheck):
     check_id = "og_tags_present"
@@ -75,28 +25,23 @@ class OpenGraphTagsCheck(BaseCheck):
                 seen.add(u.host)
                 urls_to_check.append(u)
 
-        async def run_all():
-            return await asyncio.gather(*[_fetch_head(u.raw_url) for u in urls_to_check])
-
-        results = _run_async(run_all())
+        pages = get_page_store(ctx).fetch([u.raw_url for u in urls_to_check])
+        fetchable = [p for p in pages if p.ok and p.body]
 
         missing_title: list[str] = []
         missing_image: list[str] = []
         missing_desc: list[str] = []
 
-        for r in results:
-            if r.get("error") or not r["html"]:
-                continue
-            html = r["html"]
-            url = r["url"]
-            if not _has_og(html, _OG_TITLE_RE, _OG_TITLE_RE2):
+        for page in fetchable:
+            facts = page.facts
+            url = page.url
+            if not facts.meta_content("og:title"):
                 missing_title.append(url)
-            if not _has_og(html, _OG_IMAGE_RE, _OG_IMAGE_RE2):
+            if not facts.meta_content("og:image"):
                 missing_image.append(url)
-            if not _has_og(html, _OG_DESC_RE, _OG_DESC_RE2):
+            if not facts.meta_content("og:description"):
                 missing_desc.append(url)
 
-        fetchable = [r for r in results if not r.get("error") and r["html"]]
         if not fetchable:
             return self._result(CheckStatus.skipped, "Could not fetch landing pages to check OG tags")
 
@@ -9,16 +9,10 @@ Runs async in background (tier 2).
 import re
 from urllib.parse import urlparse
 
-import httpx
-from bs4 import BeautifulSoup
-
 from agents.checks.base import BaseCheck, CheckRegistry
+from agents.net.page_store import get_page_store
 from core.models import CheckResult, CheckStatus, RunContext, Severity
-
-_HEADERS = {
-    "User-Agent": "LaunchProof-QA/1.0 (pre-launch campaign checker)",
-    "Accept": "text/html,application/xhtml+xml",
-}
+from utils.phrases import PhraseMatcher
 
 # Title patterns that indicate a broken or placeholder page
 _BAD_TITLE_RE = re.compile(
@@ -27,31 +21,9 @@ _BAD_TITLE_RE = re.compile(
     re.IGNORECASE,
 )
 
-# Cookie consent signals — presence of any of these suggests GDPR compliance
-_COOKIE_CONSENT_SIGNALS = [
-    "cookie",
-    "gdpr",
-    "consent",
-    "cookiebot",
-    "onetrust",
-    "cookieyes",
-    "usercentrics",
-    "complianz",
-    "didomi",
-    "cookieinformation",
-    "trustarc",
-]
-
-
-def _fetch_page(url: str, timeout: float = 8.0) -> dict:
-    try:
-        resp = httpx.get(url, headers=_HEADERS, follow_redirects=True, timeout=timeout)
-        html = resp.text[:150_000]
-        return {"url": url, "html": html, "status_code": resp.status_code, "error": None}
-    except httpx.TimeoutException:
-        return {"url": url, "html": "", "status_code": None, "error": "Timed out"}
-    except Exception as exc:
-        return {"url": url, "html": "", "status_code": None, "error": str(exc)}
+
+# Consent wording in the visible text, for banners without a recognised CMP script
+_CONSENT_PHRASES = PhraseMatcher({"consent": ["cookie|cookies", "gdpr", "consent"]})
 
 
 def _unique_hosts(ctx: RunContext) -> list[str]:
@@ -88,14 +60,11 @@ class CanonicalTagCheck(BaseCheck):
         missing: list[str] = []
         errors: list[str] = []
 
-        for url in urls:
-            page = _fetch_page(url)
-            if page["error"] or not page["html"]:
+        for url, page in zip(urls, get_page_store(ctx).fetch(urls)):
+            if page.error or not page.body:
                 errors.append(url)
                 continue
-            soup = BeautifulSoup(page["html"], "html.parser")
-            canonical = soup.find("link", rel=lambda r: r and "canonical" in r)
-            if not canonical:
+            if "canonical" not in page.facts.links:
                 missing.append(url)
 
         reachable = len(urls) - len(errors)
@@ -134,6 +103,7 @@ class CookieConsentCheck(BaseCheck):
     platforms = ["universal"]
     severity = Severity.minor
     tier = 2
+    uses_signatures = True
 
     def execute(self, ctx: RunContext) -> CheckResult:
         urls = _unique_hosts(ctx)
@@ -144,15 +114,15 @@ class CookieConsentCheck(BaseCheck):
         found: list[str] = []
         errors: list[str] = []
 
-        for url in urls:
-            page = _fetch_page(url)
-            if page["error"] or not page["html"]:
+        for url, page in zip(urls, get_page_store(ctx).fetch(urls)):
+            if page.error or not page.body:
                 errors.append(url)
                 continue
-            html_lower = page["html"].lower()
-            detected = [signal for signal in _COOKIE_CONSENT_SIGNALS if signal in html_lower]
-            if detected:
-                found.append(f"{url} ({detected[0]})")
+            # A known CMP script, else consent wording people can actually see
+            if vendors := page.vendor_inventory.vendors("consent") or page.signature_hits.vendors("consent"):
+                found.append(f"{url} ({vendors[0]})")
+            elif text := _CONSENT_PHRASES.first(page.text_tokens).get("consent"):
+                found.append(f"{url} (text: '{text}')")
             else:
                 missing.append(url)
 
@@ -202,14 +172,11 @@ class LandingPageTitleCheck(BaseCheck):
         errors: list[str] = []
         titles: list[str] = []
 
-        for url in urls:
-            page = _fetch_page(url)
-            if page["error"] or not page["html"]:
+        for url, page in zip(urls, get_page_store(ctx).fetch(urls)):
+            if page.error or not page.body:
                 errors.append(url)
                 continue
-            soup = BeautifulSoup(page["html"], "html.parser")
-            title_tag = soup.find("title")
-            title = title_tag.get_text(strip=True) if title_tag else ""
+            title = page.facts.title
             titles.append(f"{url} → '{title}'")
 
             if not title or _BAD_TITLE_RE.match(title):
@@ -5,57 +5,13 @@ Checks:
 - NoindexCheck: landing page must NOT have robots noindex (ad platforms penalize it)
 - ViewportMetaCheck: landing page must have <meta name="viewport"> for mobile ads
 """
-import asyncio
-import re
 from agents.checks.base import BaseCheck, CheckRegistry
-from core.models import CheckResult, CheckStatus, RunContext, Severity
-
-_NOINDEX_RE = re.compile(
-    r'<meta[^>]+name=["\']robots["\'][^>]+content=["\'][^"\']*noindex',
-    re.IGNORECASE,
-)
-_NOINDEX_RE2 = re.compile(
-    r'<meta[^>]+content=["\'][^"\']*noindex[^"\']*["\'][^>]+name=["\']robots',
-    re.IGNORECASE,
-)
-_VIEWPORT_RE = re.compile(
-    r'<meta[^>]+name=["\']viewport["\']',
-    re.IGNORECASE,
-)
-
-
-async def _fetch_head(url: str, timeout: int = 10) -> dict:
-    import httpx
-    try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; LaunchProof/1.0)"},
-        ) as client:
-            async with client.stream("GET", url) as resp:
-                if resp.status_code >= 400:
-                    return {"url": url, "error": f"HTTP {resp.status_code}", "html": ""}
-                chunks, size = [], 0
-                async for chunk in resp.aiter_bytes(4096):
-                    chunks.append(chunk)
-                    size += len(chunk)
-                    if size >= 30_000:
-                        break
-                return {"url": url, "html": b"".join(chunks).decode("utf-8", errors="replace")}
-    except Exception as exc:
-        return {"url": url, "error": str(exc), "html": ""}
-
-
-def _run_async(coro):
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                return pool.submit(asyncio.run, coro).result(timeout=60)
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+from agents.net.page_store import get_page_store
+from core.models import CheckResult, CheckStatus, PageFacts, RunContext, Severity
+
+
+def _is_noindex(facts: PageFacts) -> bool:
+    return any("noindex" in content.lower() for content in facts.meta.get("robots", ()))
 
 
 def _unique_by_host(ctx: RunContext):
@@ -79,16 +35,12 @@ class NoindexCheck(BaseCheck):
     def execute(self, ctx: RunContext) -> CheckResult:
         urls_to_check = _unique_by_host(ctx)
 
-        async def run_all():
-            return await asyncio.gather(*[_fetch_head(u.raw_url) for u in urls_to_check])
-
-        results = _run_async(run_all())
+        pages = get_page_store(ctx).fetch([u.raw_url for u in urls_to_check])
+        fetchable = [p for p in pages if p.ok and p.body]
         noindexed = [
-            r["url"] for r in results
-            if not r.get("error") and r["html"]
-            and (_NOINDEX_RE.search(r["html"]) or _NOINDEX_RE2.search(r["html"]))
+            p.url for p in fetchable
+            if _is_noindex(p.facts)
         ]
-        fetchable = [r for r in results if not r.get("error") and r["html"]]
 
         if not fetchable:
             return self._result(CheckStatus.skipped, "Could not fetch landing pages to check robots meta")
@@ -117,15 +69,9 @@ class ViewportMetaCheck(BaseCheck):
     def execute(self, ctx: RunContext) -> CheckResult:
         urls_to_check = _unique_by_host(ctx)
 
-        async def run_all():
-            return await asyncio.gather(*[_fetch_head(u.raw_url) for u in urls_to_check])
-
-        results = _run_async(run_all())
-        missing = [
-            r["url"] for r in results
-            if not r.get("error") and r["html"] and not _VIEWPORT_RE.search(r["html"])
-        ]
-        fetchable = [r for r in results if not r.get("error") and r["html"]]
+        pages = get_page_store(ctx).fetch([u.raw_url for u in urls_to_check])
+        fetchable = [p for p in pages if p.ok and p.body]
+        missing = [p.url for p in fetchable if "viewport" not in p.facts.meta]
 
         if not fetchable:
             return self._result(CheckStatus.skipped, "Could not fetch landing pages to check viewport meta")
@@ -2,143 +2,77 @@
 Tier 2 Pixel & Conversion Tracking Checks.
 Fetches landing page HTML and scans for platform pixel/tag signatures.
 
+Script and iframe origins are classified first (FetchedPage.vendor_inventory);
+the signature scan of the body only runs for pages that don't load the vendor
+from a known domain, e.g. inline snippets.
+
 Limitation: static HTML scanning only. Pixels loaded exclusively via
-server-side rendering or via GTM data layers may not be visible here.
-When GTM is present but a pixel is not found directly, we issue a warning
-rather than a hard failure — GTM could be loading it dynamically.
+server-side rendering may not be visible here. When a pixel is not found
+directly but the page loads GTM, the page's containers (gtm.js, cached
+across runs) are scanned for the same signatures and for the platform's
+built-in GTM tag templates. Only when a container cannot be read do we issue
+a warning rather than a definitive result.
 """
-import asyncio
-import time
-
-import httpx
-
 from agents.checks.base import BaseCheck, CheckRegistry
-from core.models import CheckResult, CheckStatus, RunContext, Severity
-
-# ── Pixel signatures by platform ──────────────────────────────────────────────
-
-PIXEL_SIGNATURES: dict[str, list[str]] = {
-    "meta": [
-        "connect.facebook.net/en_US/fbevents.js",
-        "connect.facebook.net/signals/config/",
-        "fbq('init'",
-        'fbq("init"',
-    ],
-    "google": [
-        "googletagmanager.com/gtag/js",
-        "gtag('config', 'G-",
-        'gtag("config", "G-',
-        "google-analytics.com/analytics.js",
-        "google-analytics.com/g/collect",
-    ],
-    "tiktok": [
-        "analytics.tiktok.com/i18n/pixel",
-        "ttq.load(",
-        "tiktok-pixel",
-    ],
-    "linkedin": [
-        "snap.licdn.com/li.lms-analytics",
-        "_linkedin_partner_id",
-        "linkedin_partner_id =",
-    ],
+from agents.net.gtm import container_ids, container_matches
+from agents.net.page_store import get_page_store
+from core.models import CheckResult, CheckStatus, FetchedPage, RunContext, Severity
+from utils.signatures import signature_catalog
+
+# Built-in GTM tag templates (the "function" of a tag in gtm.js) that install a pixel
+GTM_PIXEL_TAGS: dict[str, tuple[str, ...]] = {
+    "google": ("__googtag", "__gaawc", "__ua", "__awct", "__sp"),
+    "linkedin": ("__bzi",),
 }
 
-GTM_SIGNATURES = [
-    "googletagmanager.com/gtm.js",
-    "GTM-",
-]
-
-# Conversion event signatures — what fires on a conversion/lead page
-CONVERSION_SIGNATURES: dict[str, list[str]] = {
-    "meta": [
-        "fbq('track'",
-        'fbq("track"',
-        "fbq('trackCustom'",
-        'fbq("trackCustom"',
-    ],
-    "google": [
-        "gtag('event'",
-        'gtag("event"',
-        "ga('send', 'event'",
-        'ga("send", "event"',
-    ],
-    "tiktok": [
-        "ttq.track(",
-    ],
-    "linkedin": [
-        "lintrk(",
-        "_linkedin_data_partner_ids",
-    ],
+# Built-in GTM tag templates that fire a conversion event
+GTM_CONVERSION_TAGS: dict[str, tuple[str, ...]] = {
+    "google": ("__gaawe", "__awct"),
 }
 
 # Campaign objectives where we enforce conversion event check
 CONVERSION_OBJECTIVES = {"conversion", "lead_gen", "retargeting", "app_install"}
 
-FETCH_TIMEOUT = 10  # seconds
-
-
-# ── HTML fetcher ───────────────────────────────────────────────────────────────
-
-async def _fetch_html(url: str) -> dict:
-    """GET the page and return its text body. Returns empty string on error."""
-    try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=FETCH_TIMEOUT,
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (compatible; CampaignQA/1.0; +https://campaignqa.io)"
-                )
-            },
-        ) as client:
-            start = time.monotonic()
-            resp = await client.get(url)
-            elapsed = int((time.monotonic() - start) * 1000)
-            return {
-                "url": url,
-                "html": resp.text,
-                "status_code": resp.status_code,
-                "elapsed_ms": elapsed,
-                "ok": 200 <= resp.status_code < 400,
-                "error": None,
-            }
-    except Exception as exc:
-        return {
-            "url": url,
-            "html": "",
-            "status_code": None,
-            "elapsed_ms": 0,
-            "ok": False,
-            "error": str(exc),
-        }
-
-
-def _run_async(coro):
-    """Run a coroutine from a sync context (mirrors reachability_checks pattern)."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, coro)
-                return future.result(timeout=60)
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
-
-
-def _fetch_unique_pages(ctx: RunContext) -> list[dict]:
-    """Fetch HTML for each unique URL. Deduplicates by raw URL."""
-    unique_urls = list({u.raw_url for u in ctx.urls})
-
-    async def run_all():
-        return await asyncio.gather(*[_fetch_html(url) for url in unique_urls])
-
-    return _run_async(run_all())
-
-
-def _has_gtm(html: str) -> bool:
-    return any(sig in html for sig in GTM_SIGNATURES)
+
+def _fetch_unique_pages(ctx: RunContext) -> list[FetchedPage]:
+    """Return the run's landing pages, one per unique raw URL (fetched once per run)."""
+    unique_urls = list(dict.fromkeys(u.raw_url for u in ctx.urls))
+    return get_page_store(ctx).fetch(unique_urls)
+
+
+def _has(page: FetchedPage, kind: str, platform: str | None = None) -> bool:
+    """Vendor loaded from a known origin, else a signature anywhere in the body."""
+    return page.vendor_inventory.found(kind, platform) or page.signature_hits.found(kind, platform)
+
+
+def _has_gtm(page: FetchedPage) -> bool:
+    return _has(page, "gtm")
+
+
+def _gtm_verdicts(
+    ctx: RunContext, pages: list[FetchedPage], signatures: list[str], tag_types: tuple[str, ...],
+) -> dict[str, tuple[str, list[str]]]:
+    """
+    Look inside the GTM containers of pages whose HTML lacks the signatures.
+
+    Returns {url: (verdict, container_ids)}: "found" (the IDs of the containers
+    holding the tag), "absent" (every container was read and none holds it) or
+    "unknown" (no container ID on the page, or a container could not be fetched).
+    """
+    ids_by_url = {p.url: container_ids(p.html) for p in pages}
+    all_ids = list(dict.fromkeys(i for ids in ids_by_url.values() for i in ids))
+    containers = dict(zip(all_ids, get_page_store(ctx).gtm_containers(all_ids)))
+
+    verdicts = {}
+    for url, ids in ids_by_url.items():
+        matched = [i for i in ids if container_matches(containers[i], signatures, tag_types)]
+        if matched:
+            verdicts[url] = ("found", matched)
+        elif ids and all(containers[i]["found"] is not None for i in ids):
+            verdicts[url] = ("absent", ids)
+        else:
+            verdicts[url] = ("unknown", ids)
+    return verdicts
 
 
 # ── Check 1: Platform Pixel Present ───────────────────────────────────────────
@@ -150,18 +84,19 @@ class PlatformPixelPresentCheck(BaseCheck):
     platforms = ["meta", "google", "tiktok", "linkedin"]
     severity = Severity.critical
     tier = 2
+    uses_signatures = True
 
     def execute(self, ctx: RunContext) -> CheckResult:
-        signatures = PIXEL_SIGNATURES.get(ctx.platform.value)
+        signatures = signature_catalog().patterns("pixel", ctx.platform.value)
         if not signatures:
             return self._result(CheckStatus.skipped, "Pixel check not configured for this platform")
 
         pages = _fetch_unique_pages(ctx)
-        fetch_errors = [p for p in pages if not p["ok"]]
-        fetchable = [p for p in pages if p["ok"]]
+        fetch_errors = [p for p in pages if not p.ok]
+        fetchable = [p for p in pages if p.ok]
 
         if not fetchable:
-            urls_str = ", ".join(p["url"] for p in fetch_errors)
+            urls_str = ", ".join(p.url for p in fetch_errors)
             return self._result(
                 CheckStatus.error,
                 f"Could not fetch landing page(s) to check for pixel — {urls_str}",
@@ -170,16 +105,24 @@ class PlatformPixelPresentCheck(BaseCheck):
 
         missing_pixel = []
         gtm_fallback = []
+        via_gtm: dict[str, list[str]] = {}      # url -> containers holding the pixel
+        gtm_scanned: dict[str, list[str]] = {}  # url -> containers read, pixel not in them
 
-        for page in fetchable:
-            html = page["html"]
-            found = any(sig in html for sig in signatures)
-            if found:
-                continue
-            if _has_gtm(html):
-                gtm_fallback.append(page["url"])
+        unmatched = [p for p in fetchable if not _has(p, "pixel", ctx.platform.value)]
+        verdicts = _gtm_verdicts(
+            ctx, [p for p in unmatched if _has_gtm(p)], signatures,
+            GTM_PIXEL_TAGS.get(ctx.platform.value, ()),
+        )
+        for page in unmatched:
+            verdict, ids = verdicts.get(page.url, ("absent", []))
+            if verdict == "found":
+                via_gtm[page.url] = ids
+            elif verdict == "unknown":
+                gtm_fallback.append(page.url)
             else:
-                missing_pixel.append(page["url"])
+                missing_pixel.append(page.url)
+                if ids:
+                    gtm_scanned[page.url] = ids
 
         fetch_error_note = (
             f" ({len(fetch_errors)} page(s) could not be fetched)" if fetch_errors else ""
@@ -201,7 +144,12 @@ class PlatformPixelPresentCheck(BaseCheck):
                     "Without it, campaign conversion data will not be attributed."
                 ),
                 affected_items=missing_pixel,
-                metadata={"gtm_present_on": gtm_fallback},
+                metadata={
+                    "gtm_present_on": gtm_fallback,
+                    "gtm_containers_scanned": gtm_scanned,
+                    # Only the first fetch_max_bytes of these pages were scanned
+                    "truncated_pages": [p.url for p in fetchable if p.truncated],
+                },
             )
 
         if gtm_fallback:
@@ -210,7 +158,7 @@ class PlatformPixelPresentCheck(BaseCheck):
                 CheckStatus.warning,
                 (
                     f"{platform_label} not found directly in HTML on {len(gtm_fallback)} page(s), "
-                    f"but GTM is installed — pixel may be loading via GTM{fetch_error_note}"
+                    f"and the GTM container could not be read — pixel may be loading via GTM{fetch_error_note}"
                 ),
                 recommendation=(
                     "Verify in GTM that the pixel tag is configured and firing on All Pages. "
@@ -222,8 +170,9 @@ class PlatformPixelPresentCheck(BaseCheck):
 
         return self._result(
             CheckStatus.passed,
-            f"{ctx.platform.value.capitalize()} tracking pixel detected on all {len(fetchable)} page(s){fetch_error_note}",
-            metadata={"pages_checked": len(fetchable)},
+            f"{ctx.platform.value.capitalize()} tracking pixel detected on all {len(fetchable)} page(s)"
+            f"{f' ({len(via_gtm)} via GTM)' if via_gtm else ''}{fetch_error_note}",
+            metadata={"pages_checked": len(fetchable), "via_gtm": via_gtm},
         )
 
 
@@ -236,10 +185,11 @@ class GoogleTagManagerPresentCheck(BaseCheck):
     platforms = ["universal"]
     severity = Severity.minor
     tier = 2
+    uses_signatures = True
 
     def execute(self, ctx: RunContext) -> CheckResult:
         pages = _fetch_unique_pages(ctx)
-        fetchable = [p for p in pages if p["ok"]]
+        fetchable = [p for p in pages if p.ok]
 
         if not fetchable:
             return self._result(
@@ -248,7 +198,7 @@ class GoogleTagManagerPresentCheck(BaseCheck):
                 recommendation="Ensure destination URLs are publicly accessible",
             )
 
-        missing_gtm = [p["url"] for p in fetchable if not _has_gtm(p["html"])]
+        missing_gtm = [p.url for p in fetchable if not _has_gtm(p)]
 
         if not missing_gtm:
             return self._result(
@@ -276,6 +226,7 @@ class ConversionEventDetectedCheck(BaseCheck):
     platforms = ["meta", "google", "tiktok", "linkedin"]
     severity = Severity.major
     tier = 2
+    uses_signatures = True
 
     def execute(self, ctx: RunContext) -> CheckResult:
         objective = (ctx.campaign_objective or "").lower().replace(" ", "_")
@@ -285,12 +236,12 @@ class ConversionEventDetectedCheck(BaseCheck):
                 f"Conversion event check skipped — campaign objective is '{ctx.campaign_objective or 'not set'}' (only runs for conversion/lead_gen/retargeting/app_install)",
             )
 
-        signatures = CONVERSION_SIGNATURES.get(ctx.platform.value)
+        signatures = signature_catalog().patterns("conversion", ctx.platform.value)
         if not signatures:
             return self._result(CheckStatus.skipped, "Conversion event signatures not configured for this platform")
 
         pages = _fetch_unique_pages(ctx)
-        fetchable = [p for p in pages if p["ok"]]
+        fetchable = [p for p in pages if p.ok]
 
         if not fetchable:
             return self._result(
@@ -301,16 +252,24 @@ class ConversionEventDetectedCheck(BaseCheck):
 
         no_events = []
         gtm_possible = []
+        via_gtm: dict[str, list[str]] = {}
+        gtm_scanned: dict[str, list[str]] = {}
 
-        for page in fetchable:
-            html = page["html"]
-            found = any(sig in html for sig in signatures)
-            if found:
-                continue
-            if _has_gtm(html):
-                gtm_possible.append(page["url"])
+        unmatched = [p for p in fetchable if not _has(p, "conversion", ctx.platform.value)]
+        verdicts = _gtm_verdicts(
+            ctx, [p for p in unmatched if _has_gtm(p)], signatures,
+            GTM_CONVERSION_TAGS.get(ctx.platform.value, ()),
+        )
+        for page in unmatched:
+            verdict, ids = verdicts.get(page.url, ("absent", []))
+            if verdict == "found":
+                via_gtm[page.url] = ids
+            elif verdict == "unknown":
+                gtm_possible.append(page.url)
             else:
-                no_events.append(page["url"])
+                no_events.append(page.url)
+                if ids:
+                    gtm_scanned[page.url] = ids
 
         if no_events:
             event_examples = {
@@ -331,7 +290,12 @@ class ConversionEventDetectedCheck(BaseCheck):
                     "Without this, the platform cannot optimize toward your campaign objective."
                 ),
                 affected_items=no_events,
-                metadata={"gtm_present_on": gtm_possible},
+                metadata={
+                    "gtm_present_on": gtm_possible,
+                    "gtm_containers_scanned": gtm_scanned,
+                    # Only the first fetch_max_bytes of these pages were scanned
+                    "truncated_pages": [p.url for p in fetchable if p.truncated],
+                },
             )
 
         if gtm_possible:
@@ -339,7 +303,7 @@ class ConversionEventDetectedCheck(BaseCheck):
                 CheckStatus.warning,
                 (
                     f"No inline conversion events found on {len(gtm_possible)} page(s), "
-                    "but GTM is present — conversion events may be firing via GTM triggers"
+                    "and the GTM container could not be read — conversion events may be firing via GTM triggers"
                 ),
                 recommendation=(
                     "Verify in GTM that a conversion event fires on the correct trigger "
@@ -350,8 +314,9 @@ class ConversionEventDetectedCheck(BaseCheck):
 
         return self._result(
             CheckStatus.passed,
-            f"Conversion event tracking detected on all {len(fetchable)} page(s)",
-            metadata={"pages_checked": len(fetchable)},
+            f"Conversion event tracking detected on all {len(fetchable)} page(s)"
+            f"{f' ({len(via_gtm)} via GTM)' if via_gtm else ''}",
+            metadata={"pages_checked": len(fetchable), "via_gtm": via_gtm},
         )
 
 
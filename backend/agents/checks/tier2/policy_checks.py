@@ -1,56 +1,47 @@
 """
 Tier 2 Policy Compliance Checks — fetches landing page HTML and scans
 for signals that would violate Meta/Google ad policies.
+
+Landing pages are judged on their visible text only (PageFacts.text — no
+scripts, styles or hidden elements), matched as token phrases in linear time.
 """
-import asyncio
-import re
 from agents.checks.base import BaseCheck, CheckRegistry
-from core.models import CheckResult, CheckStatus, RunContext, Severity
-
-
-# ── Keyword lists ──────────────────────────────────────────────────────────────
-# Patterns that Meta and Google flag in landing pages / ad copy
-_GUARANTEED_RE = re.compile(
-    r"\b(guaranteed?|100\s*%\s*(free|results?|success)|risk[\s-]?free|no[\s-]?risk)\b",
-    re.IGNORECASE,
-)
-_BEFORE_AFTER_RE = re.compile(r"\bbefore\b.{0,80}\bafter\b", re.IGNORECASE | re.DOTALL)
-_PROHIBITED_CLAIMS_RE = re.compile(
-    r"\b(cure[sd]?|miracle|instant\s+results?|lose\s+\d+\s+(lbs?|pounds?|kg)\s+in|"
-    r"make\s+\$\d+\s+(a\s+day|per\s+day|daily)|work\s+from\s+home\s+and\s+earn)\b",
-    re.IGNORECASE,
-)
-_PRIVACY_POLICY_RE = re.compile(r"privacy[\s\-]?policy|privacy[\s\-]?notice", re.IGNORECASE)
-
-
-async def _fetch_html(url: str, timeout: int = 10) -> dict:
-    import httpx
-    try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; LaunchProof/1.0)"},
-        ) as client:
-            resp = await client.get(url)
-            if resp.status_code >= 400:
-                return {"url": url, "error": f"HTTP {resp.status_code}", "html": ""}
-            # Limit to first 100 KB to avoid memory issues
-            html = resp.text[:100_000]
-            return {"url": url, "html": html, "status_code": resp.status_code}
-    except Exception as exc:
-        return {"url": url, "error": str(exc), "html": ""}
-
-
-def _run_async(coro):
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                return pool.submit(asyncio.run, coro).result(timeout=60)
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+from agents.net.page_store import BotProtectionBlocked, get_page_store
+from core.models import CheckResult, CheckStatus, FetchedPage, RunContext, Severity
+from utils.phrases import PhraseMatcher, near, tokenize
+
+
+# ── Phrase lists ───────────────────────────────────────────────────────────────
+# Phrases that Meta and Google flag in landing pages / ad copy ("#" = any number)
+_POLICY_PHRASES = PhraseMatcher({
+    "guarantee": [
+        "guarantee|guaranteed",
+        "100 % free|result|results|success",
+        "risk free", "riskfree",
+        "no risk", "norisk",
+    ],
+    "prohibited": [
+        "cure|cures|cured",
+        "miracle",
+        "instant result|results",
+        "lose # lb|lbs|pound|pounds|kg in",
+        "make $ # a|per day",
+        "make $ # daily",
+        "work from home and earn",
+    ],
+})
+_PRIVACY_PHRASES = PhraseMatcher({"privacy": ["privacy policy|notice", "privacypolicy|privacynotice"]})
+
+# "before ... after" within this many words reads as a before/after comparison
+_BEFORE_AFTER_WINDOW = 15
+
+
+def _has_privacy_link(page: FetchedPage) -> bool:
+    """Privacy policy wording in the visible text, or in a link's href."""
+    if _PRIVACY_PHRASES.first(page.text_tokens):
+        return True
+    hrefs = " ".join(a.href for a in page.facts.anchors)
+    return bool(_PRIVACY_PHRASES.first(tokenize(hrefs)))
 
 
 class PrivacyPolicyPresentCheck(BaseCheck):
@@ -70,20 +61,17 @@ class PrivacyPolicyPresentCheck(BaseCheck):
                 seen_hosts.add(u.host)
                 urls_to_check.append(u)
 
-        async def run_all():
-            return await asyncio.gather(*[_fetch_html(u.raw_url) for u in urls_to_check])
-
-        results = _run_async(run_all())
+        pages = get_page_store(ctx).fetch([u.raw_url for u in urls_to_check])
 
         missing = []
-        for r in results:
-            if r.get("error") or not r["html"]:
+        for page in pages:
+            if not page.ok or not page.body:
                 continue
-            if not _PRIVACY_POLICY_RE.search(r["html"]):
-                missing.append(r["url"])
+            if not _has_privacy_link(page):
+                missing.append(page.url)
 
         if not missing:
-            fetchable = [r for r in results if not r.get("error")]
+            fetchable = [p for p in pages if p.ok]
             if not fetchable:
                 return self._result(CheckStatus.skipped, "Could not fetch landing pages to check for privacy policy")
             return self._result(
@@ -115,45 +103,60 @@ class ProhibitedClaimsCheck(BaseCheck):
                 seen_hosts.add(u.host)
                 urls_to_check.append(u)
 
-        async def run_all():
-            return await asyncio.gather(*[_fetch_html(u.raw_url) for u in urls_to_check])
-
-        results = _run_async(run_all())
-
         violations: list[str] = []
 
-        # Also check ad copy fields on the run context
+        # Ad copy first — it is the user's own text and needs no fetch
         copy_to_check = " ".join(filter(None, [ctx.headline, ctx.primary_text, ctx.description]))
 
-        for text, label in [(copy_to_check, "Ad copy")]:
-            if not text:
+        if copy_to_check:
+            hits = _POLICY_PHRASES.first(tokenize(copy_to_check))
+            if text := hits.get("guarantee"):
+                violations.append(f"Ad copy: contains '{text}' — misleading guarantee claims may get ads rejected")
+            if text := hits.get("prohibited"):
+                violations.append(f"Ad copy: contains prohibited claim '{text}'")
+
+        # A challenged landing page must not hide findings in the ad copy
+        blocked: BotProtectionBlocked | None = None
+        try:
+            pages = get_page_store(ctx).fetch([u.raw_url for u in urls_to_check])
+        except BotProtectionBlocked as exc:
+            blocked, pages = exc, []
+
+        for page in pages:
+            if not page.ok or not page.body:
                 continue
-            if m := _GUARANTEED_RE.search(text):
-                violations.append(f"{label}: contains '{m.group()}' — misleading guarantee claims may get ads rejected")
-            if m := _PROHIBITED_CLAIMS_RE.search(text):
-                violations.append(f"{label}: contains prohibited claim '{m.group()}'")
-
-        for r in results:
-            if r.get("error") or not r["html"]:
-                continue
-            label = f"Landing page ({r['url']})"
-            html = r["html"]
-            if _BEFORE_AFTER_RE.search(html):
+            label = f"Landing page ({page.url})"
+            tokens = page.text_tokens
+            if near(tokens, "before", "after", _BEFORE_AFTER_WINDOW):
                 violations.append(f"{label}: before/after comparison content detected — prohibited in health/fitness ads")
-            if m := _PROHIBITED_CLAIMS_RE.search(html):
-                violations.append(f"{label}: prohibited claim detected — '{m.group()}'")
+            if text := _POLICY_PHRASES.first(tokens).get("prohibited"):
+                violations.append(f"{label}: prohibited claim detected — '{text}'")
+
+        metadata = {"bot_protection": blocked.vendors} if blocked else {}
 
         if not violations:
+            if blocked:
+                return self._result(
+                    CheckStatus.skipped,
+                    f"{blocked}" + (" — ad copy checked, no issues found" if copy_to_check else ""),
+                    recommendation=(
+                        "The landing page served a bot challenge instead of its content. "
+                        "Verify this check manually, or allowlist the LaunchProof crawler in your CDN/WAF."
+                    ),
+                    metadata=metadata,
+                )
             return self._result(
                 CheckStatus.passed,
                 "No obvious prohibited claims detected in ad copy or landing pages",
             )
 
+        note = f" — landing page(s) not checked: {blocked}" if blocked else ""
         return self._result(
             CheckStatus.warning,
-            f"{len(violations)} potential policy violation(s) detected",
+            f"{len(violations)} potential policy violation(s) detected{note}",
             recommendation="Review flagged content against Meta and Google ad policies before launching. Policy violations can result in ad rejection or account suspension.",
             affected_items=violations,
+            metadata=metadata,
         )
 
 
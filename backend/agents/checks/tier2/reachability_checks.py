@@ -1,56 +1,22 @@
 """
 Tier 2 Reachability Checks — HTTP I/O, run async in background.
+All three checks read one shared redirect trace per URL (agents/net/redirects.py).
 """
-import asyncio
-import time
 from agents.checks.base import BaseCheck, CheckRegistry
+from agents.net.page_store import get_page_store
 from core.models import CheckResult, CheckStatus, RunContext, Severity
 
+SLOW_DNS_MS = 1000  # resolution time worth calling out in metadata
 
-async def _check_url(session, url: str, timeout: int = 8) -> dict:
-    """HEAD request with redirect following. Returns status info."""
-    import httpx
-    try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-            headers={"User-Agent": "QATool/1.0 (prelaunch-check)"},
-        ) as client:
-            start = time.monotonic()
-            resp = await client.head(url)
-            elapsed = int((time.monotonic() - start) * 1000)
-            return {
-                "url": url,
-                "status_code": resp.status_code,
-                "redirect_count": len(resp.history),
-                "final_url": str(resp.url),
-                "elapsed_ms": elapsed,
-                "ok": 200 <= resp.status_code < 400,
-            }
-    except Exception as exc:
-        return {
-            "url": url,
-            "status_code": None,
-            "redirect_count": 0,
-            "final_url": url,
-            "elapsed_ms": 0,
-            "ok": False,
-            "error": str(exc),
-        }
-
-
-def _run_async(coro):
-    """Run coroutine from sync context."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, coro)
-                return future.result(timeout=30)
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+
+def _utm_drop(hops: list[dict]) -> tuple[int, dict, list[str]] | None:
+    """Find the first redirect that lost UTM parameters present on the original URL."""
+    expected = [p for p in hops[0]["params"] if p.startswith("utm_")] if hops else []
+    for i in range(1, len(hops)):
+        lost = [p for p in expected if p not in hops[i]["params"]]
+        if lost:
+            return i, hops[i - 1], lost
+    return None
 
 
 class UrlReachabilityCheck(BaseCheck):
@@ -62,12 +28,15 @@ class UrlReachabilityCheck(BaseCheck):
     tier = 2
 
     def execute(self, ctx: RunContext) -> CheckResult:
-        async def run_all():
-            return await asyncio.gather(*[_check_url(None, u.raw_url) for u in ctx.urls])
-
-        results = _run_async(run_all())
-        unreachable = [r for r in results if not r["ok"]]
+        store = get_page_store(ctx)
+        results = store.trace([u.raw_url for u in ctx.urls])
+        # An error status may be a bot challenge served to us, not a broken page
+        challenged = store.challenges([r["url"] for r in results if not r["ok"] and r["status_code"]])
+        unreachable = [r for r in results if not r["ok"] and r["url"] not in challenged]
         slow = [r for r in results if r["ok"] and r["elapsed_ms"] > 3000]
+        # DNS is reported as its own phase so a slow resolver is not mistaken for a slow server
+        dns_ms = {r["url"]: r.get("dns_ms", 0) for r in results}
+        slow_dns = [u for u, ms in dns_ms.items() if ms >= SLOW_DNS_MS]
 
         if unreachable:
             return self._result(
@@ -77,17 +46,34 @@ class UrlReachabilityCheck(BaseCheck):
                 affected_items=[f"{r['url']} (status: {r.get('status_code', 'timeout')})" for r in unreachable],
                 metadata={"results": results},
             )
+        if challenged:
+            return self._result(
+                CheckStatus.warning,
+                f"{len(challenged)} URL(s) answered with a bot challenge "
+                f"({', '.join(sorted(set(challenged.values())))}) — reachability could not be verified",
+                recommendation=(
+                    "Open these URLs in a browser to confirm they load, and make sure the ad platforms' "
+                    "crawlers are allowlisted in your CDN/WAF — a challenged crawler can disapprove the ad."
+                ),
+                affected_items=[f"{url} ({vendor})" for url, vendor in challenged.items()],
+                metadata={"dns_ms": dns_ms, "slow_dns": slow_dns},
+            )
         if slow:
             return self._result(
                 CheckStatus.warning,
                 f"All URLs reachable, but {len(slow)} URL(s) responded slowly (>3s) — may impact Quality Score",
                 recommendation="Improve landing page load time for better ad Quality Score and conversion rates",
-                affected_items=[f"{r['url']} ({r['elapsed_ms']}ms)" for r in slow],
+                affected_items=[f"{r['url']} ({r['elapsed_ms']}ms, DNS {r.get('dns_ms', 0)}ms)" for r in slow],
+                metadata={"dns_ms": dns_ms, "slow_dns": slow_dns},
             )
         return self._result(
             CheckStatus.passed,
             f"All {len(results)} URL(s) are reachable",
-            metadata={"avg_ms": int(sum(r["elapsed_ms"] for r in results) / len(results))},
+            metadata={
+                "avg_ms": int(sum(r["elapsed_ms"] for r in results) / len(results)),
+                "dns_ms": dns_ms,
+                "slow_dns": slow_dns,
+            },
         )
 
 
@@ -101,10 +87,7 @@ class UrlRedirectDepthCheck(BaseCheck):
     MAX_REDIRECTS = 3
 
     def execute(self, ctx: RunContext) -> CheckResult:
-        async def run_all():
-            return await asyncio.gather(*[_check_url(None, u.raw_url) for u in ctx.urls])
-
-        results = _run_async(run_all())
+        results = get_page_store(ctx).trace([u.raw_url for u in ctx.urls])
         deep_redirects = [r for r in results if r.get("redirect_count", 0) > self.MAX_REDIRECTS]
 
         if not deep_redirects:
@@ -133,16 +116,18 @@ class UtmParameterPreservedThroughRedirectCheck(BaseCheck):
         if not urls_with_utm:
             return self._result(CheckStatus.skipped, "No UTM parameters to check for redirect preservation")
 
-        async def run_all():
-            return await asyncio.gather(*[_check_url(None, u.raw_url) for u in urls_with_utm])
-
-        results = _run_async(run_all())
+        results = get_page_store(ctx).trace([u.raw_url for u in urls_with_utm])
 
         stripped = []
         for r in results:
             if r["ok"] and r["redirect_count"] > 0:
-                if "utm_" not in r["final_url"]:
-                    stripped.append(f"{r['url']} → {r['final_url']} (UTM stripped)")
+                dropped = _utm_drop(r["hops"])
+                if dropped:
+                    hop_no, hop, lost = dropped
+                    stripped.append(
+                        f"{r['url']} → {r['final_url']} ({', '.join(lost)} dropped by redirect #{hop_no}: "
+                        f"{hop['status_code']} {hop['url']} → {hop['location']})"
+                    )
 
         if not stripped:
             return self._result(
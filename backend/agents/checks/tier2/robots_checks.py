@@ -0,0 +1,93 @@
+"""
+Tier 2 robots.txt Checks — verifies the ad platform's crawler may fetch every landing page.
+
+Platforms crawl destination URLs to review ads and build previews. A page the
+crawler is disallowed from gets disapproved ("destination not crawlable") or
+shows a broken preview. The crawler follows redirects, so both the ad URL and
+the page the redirect chain lands on must be allowed. robots.txt is fetched
+once per origin and cached across runs (agents/net/robots.py).
+"""
+from agents.checks.base import BaseCheck, CheckRegistry
+from agents.net.page_store import get_page_store
+from agents.net.robots import robots_origin
+from core.models import CheckResult, CheckStatus, RunContext, Severity
+
+# Product token each platform's ad crawler obeys in robots.txt
+AD_CRAWLERS: dict[str, str] = {
+    "google": "AdsBot-Google",
+    "meta": "facebookexternalhit",
+    "linkedin": "LinkedInBot",
+}
+
+
+class AdCrawlerAllowedCheck(BaseCheck):
+    """Fails if robots.txt disallows the platform's ad crawler on any destination URL."""
+    check_id = "robots_ad_crawler_allowed"
+    check_name = "Ad Crawler Allowed by robots.txt"
+    check_category = "url"
+    platforms = list(AD_CRAWLERS)
+    severity = Severity.major
+    tier = 2
+
+    def execute(self, ctx: RunContext) -> CheckResult:
+        crawler = AD_CRAWLERS.get(ctx.platform.value)
+        if not crawler:
+            return self._result(CheckStatus.skipped, "robots.txt check not configured for this platform")
+
+        urls = [u for u in dict.fromkeys(u.raw_url for u in ctx.urls) if u.startswith(("http://", "https://"))]
+        if not urls:
+            return self._result(CheckStatus.skipped, "No HTTP(S) URLs to check against robots.txt")
+
+        store = get_page_store(ctx)
+        landing = {url: trace["final_url"] or url for url, trace in zip(urls, store.trace(urls))}
+        origins = list(dict.fromkeys(robots_origin(u) for url in urls for u in (url, landing[url])))
+        robots = dict(zip(origins, store.robots(origins)))
+
+        blocked = []
+        unknown = []
+        for url in urls:
+            for target in dict.fromkeys((url, landing[url])):
+                label = url if target == url else f"{url} → {target}"
+                entry = robots[robots_origin(target)]
+                if entry["rules"] is None:
+                    unknown.append(f"{label}: {entry['error']}")
+                    break
+                allowed, rule = entry["rules"].verdict(target, crawler)
+                if not allowed:
+                    blocked.append(f"{label} ({rule})")
+                    break
+
+        metadata = {"crawler": crawler, "origins_checked": len(origins)}
+
+        if blocked:
+            return self._result(
+                CheckStatus.failed,
+                f"robots.txt blocks {crawler} from {len(blocked)} of {len(urls)} URL(s) — ads may be disapproved",
+                recommendation=(
+                    f"Add a 'User-agent: {crawler}' group with 'Allow: /' (or remove the matching "
+                    "Disallow rule) so the platform can review your landing pages."
+                ),
+                affected_items=blocked,
+                metadata=metadata,
+            )
+
+        if unknown:
+            return self._result(
+                CheckStatus.warning,
+                f"robots.txt could not be read for {len(unknown)} URL(s) — crawler access unverified",
+                recommendation=(
+                    "Make sure /robots.txt responds with 200 or 404. Crawlers treat server errors "
+                    "as 'disallow everything' until it recovers."
+                ),
+                affected_items=unknown,
+                metadata=metadata,
+            )
+
+        return self._result(
+            CheckStatus.passed,
+            f"{crawler} is allowed on all {len(urls)} URL(s) by robots.txt",
+            metadata=metadata,
+        )
+
+
+CheckRegistry.register(AdCrawlerAllowedCheck())
@@ -9,30 +9,10 @@ Runs async in background (tier 2).
 """
 from urllib.parse import urlparse
 
-import httpx
-
 from agents.checks.base import BaseCheck, CheckRegistry
+from agents.net.page_store import get_page_store
 from core.models import CheckResult, CheckStatus, RunContext, Severity
 
-_HEADERS = {
-    "User-Agent": "LaunchProof-QA/1.0 (pre-launch campaign checker)",
-}
-
-
-def _get_headers(url: str, timeout: float = 8.0) -> dict:
-    """Fetch response headers for a URL (HEAD first, fall back to GET)."""
-    try:
-        resp = httpx.head(url, headers=_HEADERS, follow_redirects=True, timeout=timeout)
-        return {"url": url, "headers": dict(resp.headers), "error": None}
-    except Exception:
-        pass
-    try:
-        resp = httpx.get(url, headers=_HEADERS, follow_redirects=True, timeout=timeout)
-        return {"url": url, "headers": dict(resp.headers), "error": None}
-    except Exception as exc:
-        return {"url": url, "headers": {}, "error": str(exc)}
-
-
 class SecurityHeaderCheck(BaseCheck):
     """
     Checks for HTTP security headers on landing pages.
@@ -72,8 +52,8 @@ class SecurityHeaderCheck(BaseCheck):
         if not unique_https:
             return self._result(CheckStatus.skipped, "No HTTPS URLs to check for security headers")
 
-        results = [_get_headers(url) for url in unique_https[:10]]
-        reachable = [r for r in results if not r["error"]]
+        pages = get_page_store(ctx).fetch(unique_https[:10])
+        reachable = [p for p in pages if not p.error]
 
         if not reachable:
             return self._result(CheckStatus.error, "Could not fetch headers from any landing page")
@@ -81,14 +61,13 @@ class SecurityHeaderCheck(BaseCheck):
         missing_per_url: list[str] = []
         all_missing_headers: set[str] = set()
 
-        for r in reachable:
-            lower_headers = {k.lower(): v for k, v in r["headers"].items()}
+        for page in reachable:
             missing = [
                 label for header, label in self._REQUIRED_HEADERS.items()
-                if header not in lower_headers
+                if header not in page.headers
             ]
             if missing:
-                missing_per_url.append(f"{r['url']} — missing: {', '.join(missing)}")
+                missing_per_url.append(f"{page.url} — missing: {', '.join(missing)}")
                 all_missing_headers.update(missing)
 
         if missing_per_url:
@@ -112,7 +91,7 @@ class SecurityHeaderCheck(BaseCheck):
         return self._result(
             CheckStatus.passed,
             f"All required security headers present on {len(reachable)} checked HTTPS page(s)",
-            metadata={"checked_urls": [r["url"] for r in reachable]},
+            metadata={"checked_urls": [p.url for p in reachable]},
         )
 
 
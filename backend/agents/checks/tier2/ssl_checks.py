@@ -1,48 +1,15 @@
 """
 Tier 2 SSL Checks — validates TLS certificate validity and expiry.
-Runs async in background (tier 2).
+Runs async in background (tier 2). Both checks share one concurrent
+certificate probe per host per run (agents/net/tls.py).
 """
-import ssl
-import socket
-from datetime import datetime, timezone
 from urllib.parse import urlparse
 
 from agents.checks.base import BaseCheck, CheckRegistry
+from agents.net.page_store import get_page_store
+from agents.net.tls import FAIL_DAYS, WARN_DAYS  # thresholds also drive the cert cache TTL
 from core.models import CheckResult, CheckStatus, RunContext, Severity
 
-WARN_DAYS = 30   # warn if cert expires within 30 days
-FAIL_DAYS = 7    # fail if cert expires within 7 days
-
-
-def _get_cert_info(hostname: str, port: int = 443, timeout: int = 8) -> dict:
-    """Retrieve SSL cert expiry info for a hostname."""
-    try:
-        ctx = ssl.create_default_context()
-        with socket.create_connection((hostname, port), timeout=timeout) as raw_sock:
-            with ctx.wrap_socket(raw_sock, server_hostname=hostname) as ssock:
-                cert = ssock.getpeercert()
-                if not cert:
-                    return {"hostname": hostname, "valid": False, "days_left": None, "expiry": None, "error": "Empty cert"}
-                not_after = str(cert.get("notAfter", ""))
-                expiry = datetime.strptime(not_after, "%b %d %H:%M:%S %Y %Z").replace(tzinfo=timezone.utc)
-                days_left = (expiry - datetime.now(timezone.utc)).days
-                return {
-                    "hostname": hostname,
-                    "valid": True,
-                    "days_left": days_left,
-                    "expiry": expiry.strftime("%Y-%m-%d"),
-                    "error": None,
-                }
-    except ssl.SSLCertVerificationError as exc:
-        return {"hostname": hostname, "valid": False, "days_left": None, "expiry": None, "error": f"Invalid cert: {exc}"}
-    except ssl.SSLError as exc:
-        return {"hostname": hostname, "valid": False, "days_left": None, "expiry": None, "error": f"SSL error: {exc}"}
-    except OSError as exc:
-        # Port 443 not open, or connection refused — skip gracefully
-        return {"hostname": hostname, "valid": None, "days_left": None, "expiry": None, "error": f"Connection error: {exc}"}
-    except Exception as exc:
-        return {"hostname": hostname, "valid": None, "days_left": None, "expiry": None, "error": str(exc)}
-
 
 class SslCertValidityCheck(BaseCheck):
     """Checks that all destination URL domains have a valid, non-expired SSL certificate."""
@@ -65,7 +32,7 @@ class SslCertValidityCheck(BaseCheck):
         if not hostnames:
             return self._result(CheckStatus.skipped, "No HTTPS URLs to check for SSL validity")
 
-        results = [_get_cert_info(h) for h in hostnames]
+        results = get_page_store(ctx).certs(list(hostnames))
 
         invalid = [r for r in results if r["valid"] is False]
         if invalid:
@@ -107,7 +74,7 @@ class SslCertExpiryCheck(BaseCheck):
         if not hostnames:
             return self._result(CheckStatus.skipped, "No HTTPS URLs to check for SSL expiry")
 
-        results = [r for r in [_get_cert_info(h) for h in hostnames] if r["valid"] is True]
+        results = [r for r in get_page_store(ctx).certs(list(hostnames)) if r["valid"] is True]
 
         if not results:
             return self._result(CheckStatus.skipped, "Could not retrieve cert info for expiry check")
@@ -1,53 +1,18 @@
 """
 Tier 2 VirusTotal Checks — domain safety via VirusTotal API.
-Skipped gracefully when VIRUSTOTAL_API_KEY is not configured.
+Local blocklist files are consulted first (agents/net/blocklist.py); the
+VirusTotal API is queried only for domains they do not list. Reports are cached
+and rate-limited process-wide (agents/net/virustotal.py).
+Skipped gracefully when neither VIRUSTOTAL_API_KEY nor BLOCKLIST_DIR is configured.
 """
-import asyncio
 from urllib.parse import urlparse
 from agents.checks.base import BaseCheck, CheckRegistry
+from agents.net.blocklist import blocklists
+from agents.net.virustotal import lookup_domains
 from core.models import CheckResult, CheckStatus, RunContext, Severity
 from core.config import get_settings
 
 
-async def _check_domain(domain: str, api_key: str) -> dict:
-    """Query VirusTotal v3 domain report."""
-    import httpx
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(
-                f"https://www.virustotal.com/api/v3/domains/{domain}",
-                headers={"x-apikey": api_key},
-            )
-            if resp.status_code == 404:
-                return {"domain": domain, "malicious": 0, "suspicious": 0, "status": "unknown"}
-            if resp.status_code == 429:
-                return {"domain": domain, "error": "rate_limited"}
-            resp.raise_for_status()
-            data = resp.json()
-            stats = data.get("data", {}).get("attributes", {}).get("last_analysis_stats", {})
-            return {
-                "domain": domain,
-                "malicious": stats.get("malicious", 0),
-                "suspicious": stats.get("suspicious", 0),
-                "harmless": stats.get("harmless", 0),
-                "status": "ok",
-            }
-    except Exception as exc:
-        return {"domain": domain, "error": str(exc)}
-
-
-def _run_async(coro):
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                return pool.submit(asyncio.run, coro).result(timeout=30)
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
-
-
 class VirusTotalDomainSafetyCheck(BaseCheck):
     check_id = "virustotal_domain_safety"
     check_name = "Domain Safety Check (VirusTotal)"
@@ -58,10 +23,11 @@ class VirusTotalDomainSafetyCheck(BaseCheck):
 
     def execute(self, ctx: RunContext) -> CheckResult:
         api_key = get_settings().virustotal_api_key
-        if not api_key:
+        blocklists.maybe_reload()
+        if not api_key and not blocklists.loaded:
             return self._result(
                 CheckStatus.skipped,
-                "Domain safety check skipped — VIRUSTOTAL_API_KEY not configured",
+                "Domain safety check skipped — neither VIRUSTOTAL_API_KEY nor BLOCKLIST_DIR configured",
             )
 
         # Deduplicate domains
@@ -69,20 +35,32 @@ class VirusTotalDomainSafetyCheck(BaseCheck):
         if not domains:
             return self._result(CheckStatus.skipped, "No domains to check")
 
-        async def run_all():
-            # VirusTotal free tier: 4 req/min — add a small delay between calls
-            results = []
-            for i, domain in enumerate(domains):
-                if i > 0:
-                    await asyncio.sleep(0.3)
-                results.append(await _check_domain(domain, api_key))
-            return results
+        # Local blocklists first — no network, no quota
+        urls = list(dict.fromkeys(u.raw_url for u in ctx.urls if u.raw_url))
+        listed = [hit for u in urls if (hit := blocklists.lookup(u))]
+        if listed:
+            return self._result(
+                CheckStatus.failed,
+                f"{len(listed)} URL(s) appear on malware/phishing blocklists — do NOT launch",
+                recommendation="Verify your destination URLs are correct and have not been compromised.",
+                affected_items=[
+                    f"{h['url']} ({h['category']}: {h['listed']} listed in {h['source']})" for h in listed
+                ],
+                metadata={"blocklist_hits": listed},
+            )
+        if not api_key:
+            return self._result(
+                CheckStatus.passed,
+                f"All {len(domains)} domain(s) are clear of local malware/phishing blocklists",
+                metadata={"source": "blocklist", "blocklist_domains": blocklists.stats()["domains"]},
+            )
 
-        results = _run_async(run_all())
+        results = lookup_domains(domains, interactive=ctx.interactive)
 
         flagged = [r for r in results if r.get("malicious", 0) > 0]
         suspicious = [r for r in results if r.get("malicious", 0) == 0 and r.get("suspicious", 0) > 2]
         errors = [r for r in results if "error" in r]
+        pending = [r["domain"] for r in results if r.get("status") == "pending"]
 
         if flagged:
             return self._result(
@@ -103,6 +81,12 @@ class VirusTotalDomainSafetyCheck(BaseCheck):
                 affected_items=[f"{r['domain']} ({r['suspicious']} suspicious)" for r in suspicious],
                 metadata={"results": results},
             )
+        if pending and len(pending) == len(results):
+            return self._result(
+                CheckStatus.skipped,
+                f"VirusTotal lookups for {len(pending)} domain(s) are queued behind the API quota — results will be ready on the next run",
+                metadata={"pending": pending},
+            )
         if errors and len(errors) == len(results):
             return self._result(
                 CheckStatus.error,
@@ -110,10 +94,24 @@ class VirusTotalDomainSafetyCheck(BaseCheck):
                 metadata={"errors": [r.get("error") for r in errors]},
             )
 
-        clean_count = len(results) - len(errors)
+        # A domain without a verdict (queued, rate-limited, failed) is never counted as clean
+        if errors:
+            verified = len(results) - len(errors)
+            return self._result(
+                CheckStatus.warning,
+                f"{verified} of {len(results)} domain(s) verified clean by VirusTotal — "
+                f"{len(errors)} could not be checked yet",
+                recommendation="Re-run the check once the VirusTotal lookups complete before launching.",
+                affected_items=[
+                    f"{r['domain']} ({'queued behind the API quota' if r.get('status') == 'pending' else r['error']})"
+                    for r in errors
+                ],
+                metadata={"results": results, "pending": pending},
+            )
+
         return self._result(
             CheckStatus.passed,
-            f"All {clean_count} domain(s) are clean according to VirusTotal",
+            f"All {len(results)} domain(s) are clean according to VirusTotal",
             metadata={"results": results},
         )
 
@@ -0,0 +1,186 @@
+"""
+Offline domain reputation from local blocklist files.
+
+Every *.txt / *.csv file in blocklist_dir is loaded: plain domain lists, hosts
+files and URLhaus / PhishTank style CSV dumps (the first URL or domain on each
+line is used). Files with "phish" in the name are phishing lists; everything
+else counts as malware.
+
+A bare domain (domain lists, hosts files) lists the whole domain: it matches
+when it or any parent domain is listed, so cdn.evil.example is caught by an
+entry for evil.example. A URL entry lists that URL only — it matches the same
+URL, or a URL below it at a path boundary, never the rest of its host. One
+phishing page on sites.google.com or bit.ly must not flag every landing page
+hosted there. Lookups are plain dict probes and need no network.
+
+The directory is re-scanned at most every blocklist_reload_interval seconds.
+When any file changed, a new snapshot is built on the side and swapped in
+with a single assignment, so lookups never see a half-loaded list.
+"""
+import ipaddress
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_SPLIT_RE = re.compile(r'[\s,;"\']+')
+_DOMAIN_RE = re.compile(r"^(?:[a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9])?\.)+[a-z][a-z0-9-]{1,62}$")
+
+
+def _url_key(url: str) -> str | None:
+    """Scheme-less key for URL matching: lower-cased host, path without trailing "/", query."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if not parts.hostname:
+        return None
+    key = parts.hostname.rstrip(".") + parts.path.rstrip("/")
+    return f"{key}?{parts.query}" if parts.query else key
+
+
+def _entry_from_line(line: str) -> tuple[str, str] | None:
+    """("url", key) or ("domain", domain) for the first URL or bare domain on a blocklist line."""
+    line = line.strip()
+    if not line or line.startswith(("#", "//", "!")):
+        return None
+    for token in _TOKEN_SPLIT_RE.split(line):
+        if "://" in token:
+            key = _url_key(token)
+            return ("url", key) if key else None
+        token = token.strip(".").lower()
+        if _DOMAIN_RE.match(token) and not _is_ip(token):
+            return "domain", token
+    return None
+
+
+def _url_prefixes(url: str):
+    """The URL's key, then each shorter key at a path boundary, down to the bare host."""
+    key = _url_key(url)
+    if key is None:
+        return
+    yield key
+    path_key = key.split("?", 1)[0]
+    if path_key != key:
+        yield path_key
+    while "/" in path_key:
+        path_key = path_key.rsplit("/", 1)[0]
+        yield path_key
+
+
+def _is_ip(value: str) -> bool:
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _parents(domain: str):
+    """domain itself, then each parent with at least two labels."""
+    labels = domain.lower().strip(".").split(".")
+    for i in range(len(labels) - 1):
+        yield ".".join(labels[i:])
+
+
+class _Snapshot:
+    """One immutable load of the blocklist directory."""
+
+    def __init__(self, domains: dict[str, tuple[str, str]], urls: dict[str, tuple[str, str]], signature: tuple):
+        self.domains = domains  # domain -> (category, source file)
+        self.urls = urls        # URL key (_url_key) -> (category, source file)
+        self.signature = signature
+        self.loaded_at = time.time()
+
+
+def _load(files: list[Path], signature: tuple) -> _Snapshot:
+    tables: dict[str, dict[str, tuple[str, str]]] = {"domain": {}, "url": {}}
+    for path in files:
+        category = "phishing" if "phish" in path.name.lower() else "malware"
+        try:
+            with path.open(encoding="utf-8", errors="replace") as fh:
+                for line in fh:
+                    if entry := _entry_from_line(line):
+                        tables[entry[0]].setdefault(entry[1], (category, path.name))
+        except OSError as exc:
+            logger.warning("Blocklist %s skipped: %s", path, exc)
+    return _Snapshot(tables["domain"], tables["url"], signature)
+
+
+class BlocklistEngine:
+    def __init__(self):
+        self._snapshot = _Snapshot({}, {}, ())
+        self._reload_lock = threading.Lock()
+        self._checked_at = 0.0
+        self.lookups = 0
+        self.hits = 0
+
+    def _files(self) -> list[Path]:
+        directory = get_settings().blocklist_dir
+        if not directory or not Path(directory).is_dir():
+            return []
+        return sorted(p for p in Path(directory).iterdir() if p.suffix in (".txt", ".csv") and p.is_file())
+
+    def maybe_reload(self) -> None:
+        """Rebuild the snapshot if the directory changed. Cheap when called often."""
+        if time.monotonic() - self._checked_at < get_settings().blocklist_reload_interval:
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return  # another thread is already checking; keep serving the current snapshot
+        try:
+            self._checked_at = time.monotonic()
+            files = self._files()
+            signature = tuple((p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in files)
+            if signature != self._snapshot.signature:
+                snapshot = _load(files, signature)
+                self._snapshot = snapshot  # atomic swap
+                logger.info(
+                    "Blocklists loaded: %d domain(s), %d URL(s) from %d file(s)",
+                    len(snapshot.domains), len(snapshot.urls), len(files),
+                )
+        except OSError as exc:
+            logger.warning("Blocklist reload skipped: %s", exc)
+        finally:
+            self._reload_lock.release()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._snapshot.domains or self._snapshot.urls)
+
+    def lookup(self, url: str) -> dict | None:
+        """The listing that covers url — its domain (or a parent) or the URL itself — or None."""
+        snapshot = self._snapshot
+        self.lookups += 1
+        domain = (urlsplit(url).hostname or "").rstrip(".")
+        for candidate in _parents(domain):
+            if listing := snapshot.domains.get(candidate):
+                return self._hit(url, domain, candidate, listing)
+        for candidate in _url_prefixes(url):
+            if listing := snapshot.urls.get(candidate):
+                return self._hit(url, domain, candidate, listing)
+        return None
+
+    def _hit(self, url: str, domain: str, listed: str, listing: tuple[str, str]) -> dict:
+        self.hits += 1
+        category, source = listing
+        return {"url": url, "domain": domain, "listed": listed, "category": category, "source": source}
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "domains": len(snapshot.domains),
+            "urls": len(snapshot.urls),
+            "files": len(snapshot.signature),
+            "loaded_at": snapshot.loaded_at if self.loaded else None,
+            "lookups": self.lookups,
+            "hits": self.hits,
+        }
+
+
+blocklists = BlocklistEngine()
@@ -0,0 +1,117 @@
+"""
+Per-host circuit breaker for Tier 2 network I/O.
+
+The first connection-level failure against a host:port (DNS failure,
+refused / unreachable connection, connect timeout) opens the breaker for host_breaker_ttl seconds. While it is open, every
+scheduler slot for that host fails fast with HostUnavailable carrying the
+recorded cause, instead of each check waiting out its own timeout. The page
+store additionally keeps a host dead for the rest of its run.
+
+Failures after the connection is up (read timeouts, dropped or malformed
+responses) do not trip it — the host answered and may only be slow on one
+page. Neither do TLS verification failures: the SSL checks need to see the
+certificate error itself.
+"""
+import asyncio
+import ssl
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.config import get_settings
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class HostUnavailable(Exception):
+    """Raised instead of connecting to a host that recently failed."""
+
+    def __init__(self, cause: str):
+        super().__init__(f"Host unreachable (earlier failure): {cause}")
+        self.cause = cause
+
+
+def host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{(parts.hostname or '').lower()}:{parts.port or _DEFAULT_PORTS.get(parts.scheme, 0)}"
+
+
+def _is_tls_error(exc: BaseException) -> bool:
+    """Whether an ssl.SSLError is anywhere in exc's cause / context chain."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, ssl.SSLError):
+            return True
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _is_host_failure(exc: BaseException) -> bool:
+    if isinstance(exc, HostUnavailable):
+        return False
+    if isinstance(exc, httpx.PoolTimeout):
+        return False  # our own connection pool was full — says nothing about the host
+    if _is_tls_error(exc):
+        return False
+    if isinstance(exc, (httpx.ConnectTimeout, httpx.ConnectError)):
+        return True
+    if isinstance(exc, httpx.HTTPError):
+        return False  # the connection was made: read/write timeouts, protocol errors
+    # Raw sockets (TLS probe): refused, unreachable, DNS, connect timeout
+    return isinstance(exc, (OSError, asyncio.TimeoutError))
+
+
+def _failed_url(exc: BaseException, url: str) -> str:
+    """The URL of the request that failed — a redirect may have moved to another host."""
+    try:
+        return str(exc.request.url)  # httpx.RequestError
+    except (AttributeError, RuntimeError):
+        return url
+
+
+class HostBreaker:
+    def __init__(self):
+        self._open: dict[str, tuple[float, str]] = {}  # host:port -> (expires_at, cause)
+        self.trips = 0
+        self.short_circuits = 0
+
+    def cause(self, url: str) -> str | None:
+        """The recorded failure if the breaker for url's host is open."""
+        key = host_key(url)
+        entry = self._open.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._open[key]
+            return None
+        return entry[1]
+
+    def guard(self, url: str) -> None:
+        """Raise HostUnavailable if url's host is known to be down."""
+        if cause := self.cause(url):
+            self.short_circuits += 1
+            raise HostUnavailable(cause)
+
+    def record(self, url: str, exc: BaseException, cause: str) -> None:
+        """Open the breaker if exc means the host itself is unreachable."""
+        if _is_host_failure(exc):
+            now = time.monotonic()
+            if len(self._open) > 1024:
+                self._open = {k: v for k, v in self._open.items() if v[0] > now}
+            key = host_key(_failed_url(exc, url))
+            if key not in self._open:
+                self.trips += 1
+            self._open[key] = (now + get_settings().host_breaker_ttl, cause)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "open_hosts": sum(1 for expires, _ in self._open.values() if expires > now),
+            "trips": self.trips,
+            "short_circuits": self.short_circuits,
+        }
+
+
+breaker = HostBreaker()
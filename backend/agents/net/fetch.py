@@ -0,0 +1,130 @@
+"""
+Landing page fetch primitive used by the per-run page store.
+Never raises — transport failures are recorded on FetchedPage.error.
+
+Bodies are always streamed against a hard byte budget (fetch_max_bytes),
+enforced while reading: once the budget is spent the connection is dropped
+and the page is marked truncated, so worker memory stays flat however large
+the landing page is.
+
+Full pages with validators go into the cross-run page cache
+(agents/net/page_cache.py); later fetches of the same URL are conditional
+and a 304 returns the cached page. Concurrent fetches of the same normalized
+URL from any run share one request (agents/net/single_flight.py), and a
+host that just failed is not retried (agents/net/breaker.py).
+"""
+import time
+
+import httpx
+
+from agents.net.breaker import breaker
+from agents.net.page_cache import normalize_url, page_cache
+from agents.net.scheduler import get_scheduler
+from agents.net.single_flight import flights
+from agents.net.tls import cert_facts
+from core.config import get_settings
+from core.models import FetchedPage
+from utils.http_client import get_http_client
+
+FETCH_TIMEOUT = 10  # seconds
+
+USER_AGENT = "Mozilla/5.0 (compatible; LaunchProof/1.0)"
+
+PAGE_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml",
+}
+
+
+def _peer_cert(resp: httpx.Response) -> dict | None:
+    """Certificate facts for the final host, read off the connection the fetch used."""
+    if resp.url.scheme != "https":
+        return None
+    stream = resp.extensions.get("network_stream")
+    ssl_object = stream.get_extra_info("ssl_object") if stream is not None else None
+    if ssl_object is None:
+        return None
+    try:
+        return cert_facts(resp.url.host, ssl_object.getpeercert())
+    except Exception:
+        return None
+
+
+async def read_capped(resp: httpx.Response, max_bytes: int) -> tuple[bytes, bool]:
+    """Read at most max_bytes of (decoded) body. Returns (body, truncated)."""
+    buf = bytearray()
+    async for chunk in resp.aiter_bytes():
+        room = max_bytes - len(buf)
+        if len(chunk) > room:
+            buf += chunk[:room]
+            return bytes(buf), True
+        buf += chunk
+    return bytes(buf), False
+
+
+async def fetch_page(
+    url: str, timeout: float = FETCH_TIMEOUT, use_cache: bool = True,
+) -> FetchedPage:
+    """
+    GET a page following redirects and capture status, headers, timing and body.
+
+    use_cache=False skips revalidation against the page cache (the fresh
+    response still replaces the cached copy) and never joins a flight that
+    may revalidate.
+    """
+    page = await flights.do(
+        ("page", normalize_url(url), use_cache), lambda: _fetch_page(url, timeout, use_cache=use_cache),
+    )
+    return page if page.url == url else page.model_copy(update={"url": url})
+
+
+async def _fetch_page(url: str, timeout: float, use_cache: bool) -> FetchedPage:
+    cached = page_cache.lookup(url) if use_cache else None
+    headers = {**PAGE_HEADERS, **page_cache.conditional_headers(cached)} if cached else PAGE_HEADERS
+    try:
+        async with get_scheduler().slot(url):
+            start = time.monotonic()  # queueing for a slot is not page time
+            async with get_http_client().stream(
+                "GET", url, headers=headers, follow_redirects=True, timeout=timeout,
+            ) as resp:
+                cert = _peer_cert(resp)
+                if resp.status_code == 304 and cached is not None:
+                    # httpx forwards the validators across redirects; a 304 only
+                    # vouches for the cached page if the chain still ends there
+                    if normalize_url(str(resp.url)) == normalize_url(cached.final_url or cached.url):
+                        return page_cache.revalidated(
+                            cached,
+                            url=url,
+                            headers={**cached.headers, **{k.lower(): v for k, v in resp.headers.items()}},
+                            redirects=[str(r.url) for r in resp.history],
+                            elapsed_ms=int((time.monotonic() - start) * 1000),
+                            cert=cert or cached.cert,
+                        )
+                    page = None
+                else:
+                    body, truncated = await read_capped(resp, get_settings().fetch_max_bytes)
+                    elapsed = int((time.monotonic() - start) * 1000)
+                    page = FetchedPage(
+                        url=url,
+                        final_url=str(resp.url),
+                        status_code=resp.status_code,
+                        headers={k.lower(): v for k, v in resp.headers.items()},
+                        redirects=[str(r.url) for r in resp.history],
+                        elapsed_ms=elapsed,
+                        body=body,
+                        truncated=truncated,
+                        cert=cert,
+                    )
+        if page is None:
+            # The redirect now lands on another URL: fetch that page without validators
+            page_cache.changed += 1
+            return await _fetch_page(url, timeout, use_cache=False)
+        page_cache.store(url, page, replaced=cached is not None)
+        return page
+    except Exception as exc:
+        if isinstance(exc, httpx.TimeoutException):
+            error = f"Request timed out (>{timeout:g}s)"
+        else:
+            error = str(exc) or exc.__class__.__name__
+        breaker.record(url, exc, error)
+        return FetchedPage(url=url, final_url=url, error=error)
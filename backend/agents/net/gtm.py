@@ -0,0 +1,151 @@
+"""
+Google Tag Manager container fetch and cache.
+
+A page that loads GTM usually carries its tracking tags inside the container,
+where a static HTML scan cannot see them. The container itself is public:
+https://www.googletagmanager.com/gtm.js?id=GTM-XXXX returns its tags, triggers
+and variables as a JS data literal followed by the GTM runtime.
+
+Only the data literal is kept, with JS string escapes (\\x3c, \\u003c, \\/, \\")
+undone so the pixel and conversion signatures match as they would in page
+HTML. Built-in tag templates are listed by their function name (__gaawc,
+__awct, __bzi, ...).
+
+Hundreds of runs share the same few containers, so each one is fetched once
+per gtm_cache_ttl for the whole process, whatever run or tenant asks;
+concurrent fetches of one container share a request. Unknown container IDs
+(404) are remembered for a short while; network failures are not cached.
+"""
+import re
+import time
+
+import httpx
+
+from agents.net.breaker import breaker
+from agents.net.fetch import FETCH_TIMEOUT, USER_AGENT, read_capped
+from agents.net.scheduler import get_scheduler
+from agents.net.single_flight import flights
+from core.config import get_settings
+from utils.http_client import get_http_client
+
+GTM_JS_URL = "https://www.googletagmanager.com/gtm.js?id={container_id}"
+MAX_CONTAINERS_PER_PAGE = 5
+
+_CONTAINER_ID_RE = re.compile(r"\bGTM-[A-Z0-9]{4,10}\b")
+_JS_ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|[/\"'\\])")
+_TAG_FUNCTION_RE = re.compile(r'"function"\s*:\s*"(__[A-Za-z0-9_]+)"')
+_NOT_FOUND_TTL = 600  # seconds a 404 is remembered
+_MAX_ENTRIES = 2_000
+
+
+def container_ids(html: str) -> list[str]:
+    """GTM container IDs referenced by a page, in order of appearance."""
+    return list(dict.fromkeys(_CONTAINER_ID_RE.findall(html)))[:MAX_CONTAINERS_PER_PAGE]
+
+
+def _unescape_js(text: str) -> str:
+    def replace(match: re.Match) -> str:
+        escape = match.group(1)
+        return chr(int(escape[1:], 16)) if escape[0] in "xu" else escape
+    return _JS_ESCAPE_RE.sub(replace, text)
+
+
+def _config_section(script: str) -> str:
+    """The container's data literal — tags, triggers, variables — without the runtime."""
+    start = script.find("var data")
+    if start == -1:
+        return script
+    end = script.find("\n/*", start)
+    return script[start:end] if end != -1 else script[start:]
+
+
+def parse_container(container_id: str, script: str) -> dict:
+    config = _unescape_js(_config_section(script))
+    return {
+        "id": container_id,
+        "found": True,
+        "config": config,
+        "tag_types": sorted(set(_TAG_FUNCTION_RE.findall(config))),
+        "error": None,
+    }
+
+
+def container_matches(container: dict, signatures: list[str], tag_types: tuple[str, ...] = ()) -> bool:
+    """Whether a fetched container holds any of the signatures or built-in tag types."""
+    if not container.get("found"):
+        return False
+    config = container["config"]
+    return any(sig in config for sig in signatures) or any(t in container["tag_types"] for t in tag_types)
+
+
+class ContainerCache:
+    """Process-wide parsed containers by ID. Only touched from the client loop."""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def get(self, container_id: str) -> dict | None:
+        entry = self._entries.get(container_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(container_id, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, container: dict) -> None:
+        if container["found"] is None:
+            return  # transport failure — try again next time
+        ttl = get_settings().gtm_cache_ttl if container["found"] else _NOT_FOUND_TTL
+        self._entries.pop(container["id"], None)
+        self._entries[container["id"]] = (time.monotonic() + ttl, container)
+        while len(self._entries) > _MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+gtm_cache = ContainerCache()
+
+
+async def fetch_container(container_id: str, use_cache: bool = True, timeout: float = FETCH_TIMEOUT) -> dict:
+    """Fetch and parse one GTM container, through the cache. Never raises."""
+    if not use_cache:
+        gtm_cache.bypassed += 1
+    elif cached := gtm_cache.get(container_id):
+        return cached
+    container = await flights.do(("gtm", container_id), lambda: _fetch(container_id, timeout))
+    gtm_cache.put(container)
+    return container
+
+
+async def _fetch(container_id: str, timeout: float) -> dict:
+    url = GTM_JS_URL.format(container_id=container_id)
+    try:
+        async with get_scheduler().slot(url):
+            async with get_http_client().stream(
+                "GET", url, headers={"User-Agent": USER_AGENT}, follow_redirects=True, timeout=timeout,
+            ) as resp:
+                if resp.status_code == 404:
+                    return {"id": container_id, "found": False, "config": "", "tag_types": [], "error": "Container not found"}
+                resp.raise_for_status()
+                body, _ = await read_capped(resp, get_settings().fetch_max_bytes)
+        return parse_container(container_id, body.decode("utf-8", errors="replace"))
+    except Exception as exc:
+        if isinstance(exc, httpx.TimeoutException):
+            error = f"Request timed out (>{timeout:g}s)"
+        else:
+            error = str(exc) or exc.__class__.__name__
+        breaker.record(url, exc, error)
+        return {"id": container_id, "found": None, "config": "", "tag_types": [], "error": error}
@@ -0,0 +1,123 @@
+"""
+Cross-run landing page cache.
+
+Scheduled and manual re-runs mostly hit pages that have not changed since the
+last run. Full 200 responses that carry a validator (ETag / Last-Modified) are
+kept here, keyed by the normalized final URL, with the requested URL as an
+alias. The next fetch of that URL sends If-None-Match / If-Modified-Since and,
+on a 304, is served the stored page (FetchedPage.source == "cache") — one
+round trip, no body bytes.
+
+Bounded by total body bytes (LRU) and by age (page_cache_max_bytes,
+page_cache_max_age). Only touched from the shared client loop.
+"""
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+from core.config import get_settings
+from core.models import FetchedPage
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lower-case scheme/host, no default port, no fragment."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def _cacheable(page: FetchedPage) -> bool:
+    if page.status_code != 200 or page.error:
+        return False
+    if "no-store" in page.headers.get("cache-control", "").lower():
+        return False
+    return bool(page.headers.get("etag") or page.headers.get("last-modified"))
+
+
+class PageCache:
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, FetchedPage]] = OrderedDict()
+        self._aliases: dict[str, str] = {}  # normalized requested URL -> entry key
+        self._bytes = 0
+        self.hits = 0          # 304 served from cache
+        self.misses = 0        # no usable entry
+        self.changed = 0       # entry existed but the page came back with a new body
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def lookup(self, url: str) -> FetchedPage | None:
+        key = self._aliases.get(normalize_url(url))
+        entry = self._entries.get(key) if key else None
+        if entry is None or time.monotonic() - entry[0] > get_settings().page_cache_max_age:
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    @staticmethod
+    def conditional_headers(page: FetchedPage) -> dict[str, str]:
+        headers = {}
+        if etag := page.headers.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := page.headers.get("last-modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def revalidated(self, cached: FetchedPage, **update) -> FetchedPage:
+        """
+        The stored page, refreshed with the 304's request-specific fields. A fresh
+        model, not model_copy — cached properties (challenge, facts, vendor
+        inventory) must be recomputed from the new headers and URL.
+        """
+        self.hits += 1
+        self.bytes_saved += len(cached.body)
+        return FetchedPage(**{**cached.model_dump(), **update, "source": "cache"})
+
+    def store(self, url: str, page: FetchedPage, replaced: bool = False) -> None:
+        if replaced:
+            self.changed += 1
+        if not _cacheable(page):
+            return
+        settings = get_settings()
+        size = len(page.body)
+        if size > settings.page_cache_max_bytes:
+            return
+        key = normalize_url(page.final_url or url)
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic(), page)
+        self._bytes += size
+        self._aliases[key] = key
+        self._aliases[normalize_url(url)] = key
+        while self._bytes > settings.page_cache_max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, page = self._entries.pop(key)
+        self._bytes -= len(page.body)
+        for alias in [a for a, k in self._aliases.items() if k == key]:
+            del self._aliases[alias]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.changed
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "changed": self.changed,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+page_cache = PageCache()
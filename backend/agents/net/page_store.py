@@ -0,0 +1,259 @@
+"""
+Per-run landing page store.
+
+Tier 2 checks run in parallel threads and most of them need the same landing
+pages. The store hangs off the RunContext and fetches each distinct URL once;
+every check asking for that URL afterwards (or while the fetch is in flight)
+gets the same FetchedPage — status, headers, timing, redirect history and body.
+Redirect-chain traces, TLS certificate facts, timing samples, GTM
+containers and robots.txt files are memoized the same way.
+
+The store also notes which pages each check read and whether they came from
+the cross-run page cache; BaseCheck.run copies that into the result metadata
+as "page_sources" (and, for checks reading tracking signatures, each page's
+vendor inventory as "vendor_inventory").
+
+Pages that turn out to be bot challenges / WAF blocks (FetchedPage.challenge)
+are never handed to a check as content: fetch() returns them as errored pages
+("Blocked by bot protection"), or raises BotProtectionBlocked when every page
+a check asked for is blocked — BaseCheck.run turns that into one explained
+skipped result.
+
+A host that fails at the connection level stays dead for the rest of the run
+(on top of the process-wide breaker TTL in agents/net/breaker.py): later
+loads for it return the recorded cause without touching the network.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, wait
+from contextvars import ContextVar
+
+from agents.net.breaker import HostUnavailable, breaker, host_key
+from agents.net.fetch import fetch_page
+from agents.net.gtm import GTM_JS_URL, fetch_container
+from agents.net.redirects import trace_redirects
+from agents.net.robots import fetch_robots
+from agents.net.timing import measure_page
+from agents.net.tls import cert_cache, probe_cert
+from core.models import FetchedPage, RunContext
+from utils.http_client import submit
+
+# How long a check waits on the run's fetches — they may queue behind the
+# per-host caps in agents/net/scheduler.py
+WAIT_TIMEOUT = 180  # seconds
+
+_store_lock = threading.Lock()
+
+# check_id of the check running in the current thread — set by BaseCheck.run
+current_check: ContextVar[str | None] = ContextVar("current_check", default=None)
+
+
+class BotProtectionBlocked(Exception):
+    """Every page a check asked for is a bot challenge / WAF block page."""
+
+    def __init__(self, vendors: dict[str, str]):
+        self.vendors = vendors  # url -> vendor
+        names = ", ".join(sorted(set(vendors.values())))
+        super().__init__(f"Blocked by bot protection ({names}) on {len(vendors)} page(s) — content could not be checked")
+
+
+def _as_blocked(page: FetchedPage) -> FetchedPage:
+    # A fresh model, not model_copy — cached html/charset must not carry over
+    return FetchedPage(**page.model_dump(exclude={"body", "error"}), error=f"Blocked by bot protection ({page.challenge})")
+
+
+def _page_error(url: str, exc: Exception) -> FetchedPage:
+    return FetchedPage(url=url, final_url=url, error=str(exc))
+
+
+def _trace_error(url: str, exc: Exception) -> dict:
+    return {
+        "url": url, "status_code": None, "redirect_count": 0, "final_url": url,
+        "elapsed_ms": 0, "ok": False, "error": str(exc), "dns_ms": 0, "hops": [],
+    }
+
+
+class PageStore:
+    """Fetch-once cache of landing pages (and redirect traces) for a single run. Thread-safe."""
+
+    def __init__(self, force_refresh: bool = False):
+        # force_refresh: bypass cross-run caches for this run (fresh network reads)
+        self.force_refresh = force_refresh
+        self._lock = threading.Lock()
+        self._pages: dict[str, Future] = {}
+        self._traces: dict[str, Future] = {}
+        self._certs: dict[str, Future] = {}
+        self._timings: dict[str, Future] = {}
+        self._containers: dict[str, Future] = {}
+        self._robots: dict[str, Future] = {}
+        self._sources: dict[str, dict[str, str]] = {}  # check_id -> {url: "network" | "cache"}
+        self._blocked: dict[str, dict[str, str]] = {}  # check_id -> {url: bot-protection vendor}
+        self._dead: dict[str, str] = {}  # host:port -> failure cause, for this run
+
+    async def _load_into(self, future: Future, load, key: str, target: str, on_error) -> None:
+        """Resolve future with load(key), unless target's host already failed during this run."""
+        host = host_key(target)
+        try:
+            if cause := self._dead.get(host):
+                value = on_error(key, HostUnavailable(cause))
+            else:
+                value = await load(key)
+                if cause := breaker.cause(target):
+                    self._dead.setdefault(host, cause)
+        except Exception as exc:
+            value = on_error(key, exc)
+        future.set_result(value)
+
+    def _start(self, table: dict[str, Future], urls: list[str], load, on_error, target=None) -> None:
+        """
+        Start `load` on the client loop for URLs not seen before, without waiting.
+        `target` maps a key to the URL whose host it contacts (default: the key itself).
+        """
+        with self._lock:
+            new = [u for u in dict.fromkeys(urls) if u not in table]
+            for url in new:
+                table[url] = Future()
+        for url in new:
+            submit(self._load_into(table[url], load, url, target(url) if target else url, on_error))
+
+    def _get_many(self, table: dict[str, Future], urls: list[str], load, on_error, target=None) -> list:
+        """Resolve each URL through `table`, running `load` once for URLs not seen before."""
+        if not urls:
+            return []
+        self._start(table, urls, load, on_error, target)
+        # Entries started by another check's thread (or the warm-up) may still be in flight
+        futures = [table[u] for u in urls]
+        wait(futures, timeout=WAIT_TIMEOUT)
+        return [
+            f.result() if f.done() else on_error(u, TimeoutError(f"No result within {WAIT_TIMEOUT}s"))
+            for u, f in zip(urls, futures)
+        ]
+
+    def warm_up(self, urls: list[str]) -> None:
+        """
+        Start DNS, connection setup, page fetches and redirect traces for a run's
+        URLs in the background. Called by the create-run routes before Tier 1, so
+        Tier 2 checks find the work done or in flight.
+        """
+        urls = [u for u in dict.fromkeys(urls) if u.startswith(("http://", "https://"))]
+        self._start(self._pages, urls, self._fetch_full, _page_error)
+        self._start(self._traces, urls, trace_redirects, _trace_error)
+
+    def _fetch_full(self, url: str):
+        return fetch_page(url, use_cache=not self.force_refresh)
+
+    def fetch(self, urls: list[str]) -> list[FetchedPage]:
+        """
+        Return one FetchedPage per URL (in order), fetching only URLs not seen before.
+        Raises BotProtectionBlocked if every page is a bot challenge.
+        """
+        pages = self._get_many(self._pages, urls, self._fetch_full, _page_error)
+
+        blocked = {p.url: p.challenge for p in pages if p.challenge}
+        if check_id := current_check.get():
+            with self._lock:
+                self._sources.setdefault(check_id, {}).update(
+                    (p.url, p.source) for p in pages if not p.error
+                )
+                if blocked:
+                    self._blocked.setdefault(check_id, {}).update(blocked)
+        if blocked and len(blocked) == len(set(urls)):
+            raise BotProtectionBlocked(blocked)
+        return [_as_blocked(p) if p.challenge else p for p in pages]
+
+    def challenges(self, urls: list[str]) -> dict[str, str]:
+        """
+        {url: bot-protection vendor} for URLs whose page is a challenge. Never raises —
+        for checks that judge the trace / timing of a URL rather than its content.
+        """
+        pages = self._get_many(self._pages, urls, self._fetch_full, _page_error)
+        blocked = {p.url: p.challenge for p in pages if p.challenge}
+        if blocked and (check_id := current_check.get()):
+            with self._lock:
+                self._blocked.setdefault(check_id, {}).update(blocked)
+        return blocked
+
+    def sources(self, check_id: str) -> dict[str, str]:
+        """{url: "network" | "cache"} for the pages a check read."""
+        with self._lock:
+            return dict(self._sources.get(check_id, {}))
+
+    def blocked(self, check_id: str) -> dict[str, str]:
+        """{url: vendor} for the pages a check got bot challenges for."""
+        with self._lock:
+            return dict(self._blocked.get(check_id, {}))
+
+    def vendor_inventory(self, check_id: str) -> dict[str, dict[str, list[str]]]:
+        """{url: {kind: vendors}} for the full pages a check read."""
+        with self._lock:
+            futures = [self._pages.get(u) for u in self._sources.get(check_id, {})]
+        pages = [f.result() for f in futures if f is not None and f.done()]
+        return {p.url: p.vendor_inventory.summary() for p in pages if p.ok and not p.challenge}
+
+    def trace(self, urls: list[str]) -> list[dict]:
+        """Return one redirect trace per URL (in order); see agents.net.redirects."""
+        return self._get_many(self._traces, urls, trace_redirects, _trace_error)
+
+    def timings(self, urls: list[str]) -> list[dict]:
+        """Return cold/warm timing summaries per URL (in order); see agents.net.timing."""
+        return self._get_many(self._timings, urls, self._measure, lambda u, exc: {"url": u, "error": str(exc)})
+
+    async def _measure(self, url: str) -> dict:
+        # The run's page fetch warms the pool and doubles as the first warm sample
+        self._start(self._pages, [url], self._fetch_full, _page_error)
+        page = await asyncio.wrap_future(self._pages[url])
+        if page.challenge:
+            return {"url": url, "challenge": page.challenge}  # timing the interstitial means nothing
+        return await measure_page(url, page)
+
+    def certs(self, hostnames: list[str]) -> list[dict]:
+        """Return certificate facts per hostname (in order); see agents.net.tls."""
+        return self._get_many(
+            self._certs, hostnames, self._load_cert,
+            lambda h, exc: {"hostname": h, "valid": None, "days_left": None, "expiry": None, "error": str(exc)},
+            target=lambda h: f"https://{h}/",
+        )
+
+    def gtm_containers(self, container_ids: list[str]) -> list[dict]:
+        """Return one parsed GTM container per ID (in order); see agents.net.gtm."""
+        return self._get_many(
+            self._containers, container_ids, self._load_container,
+            lambda c, exc: {"id": c, "found": None, "config": "", "tag_types": [], "error": str(exc)},
+            target=lambda c: GTM_JS_URL.format(container_id=c),
+        )
+
+    def _load_container(self, container_id: str):
+        return fetch_container(container_id, use_cache=not self.force_refresh)
+
+    def robots(self, origins: list[str]) -> list[dict]:
+        """Return one parsed robots.txt per origin (in order); see agents.net.robots."""
+        return self._get_many(
+            self._robots, origins, self._load_robots,
+            lambda o, exc: {"origin": o, "status_code": None, "rules": None, "error": str(exc)},
+            target=lambda o: f"{o}/robots.txt",
+        )
+
+    def _load_robots(self, origin: str):
+        return fetch_robots(origin, use_cache=not self.force_refresh)
+
+    async def _load_cert(self, hostname: str) -> dict:
+        if self.force_refresh:
+            cert_cache.bypassed += 1
+        elif cached := cert_cache.get(hostname):
+            return cached
+        # Reuse the handshake of a landing page fetch that already finished on this host
+        with self._lock:
+            done = [f.result() for f in self._pages.values() if f.done()]
+        facts = next((p.cert for p in done if p.cert and p.cert["hostname"] == hostname), None)
+        if facts is None:
+            facts = await probe_cert(hostname)
+        cert_cache.put(facts)
+        return facts
+
+
+def get_page_store(ctx: RunContext) -> PageStore:
+    """Return the run's page store, creating it on first use."""
+    with _store_lock:
+        if ctx._page_store is None:
+            ctx._page_store = PageStore(force_refresh=ctx.force_refresh)
+        return ctx._page_store
@@ -0,0 +1,191 @@
+"""
+robots.txt fetch, parse and match, with a per-origin cache.
+
+Ad platforms crawl landing pages before approving an ad, and their crawlers
+obey robots.txt. Rules follow Google's robots.txt spec (RFC 9309):
+
+- A crawler obeys the group with the longest user-agent value that prefixes
+  its product token (case-insensitive), else the "*" group. Groups naming the
+  same agent are merged. AdsBot-Google ignores "*" and only obeys groups that
+  name it.
+- Among the group's rules the longest matching pattern wins; on a tie allow
+  wins. "*" matches any run of characters and a trailing "$" anchors the end.
+- A 4xx (other than 429) robots.txt means no restrictions. A 5xx, a 429 or a
+  network failure leaves the rules unknown.
+
+Each rule is compiled to a regex once, ordered longest first, so matching a
+URL is a walk down the list to the first hit. Parsed files are cached per
+origin (scheme://host:port) for robots_cache_ttl across runs, so a run with
+50 URLs on one host costs one robots.txt fetch. Unknown results are not cached.
+"""
+import re
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from agents.net.breaker import breaker
+from agents.net.fetch import FETCH_TIMEOUT, USER_AGENT, read_capped
+from agents.net.scheduler import get_scheduler
+from agents.net.single_flight import flights
+from core.config import get_settings
+from utils.http_client import get_http_client
+
+MAX_ROBOTS_BYTES = 512_000  # Google ignores anything past 500 KiB
+_MAX_ENTRIES = 5_000
+_AGENTS_IGNORING_WILDCARD = ("adsbot-google",)
+
+
+def robots_origin(url: str) -> str:
+    """scheme://host[:port] whose /robots.txt governs url."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.rsplit('@', 1)[-1].lower()}"
+
+
+def _compile(pattern: str) -> re.Pattern:
+    anchored = pattern.endswith("$")
+    body = ".*".join(re.escape(piece) for piece in pattern.rstrip("$").split("*"))
+    return re.compile(body + ("$" if anchored else ""))
+
+
+class RobotsRules:
+    """One parsed robots.txt. Immutable once built; safe to share across threads."""
+
+    def __init__(self, text: str = ""):
+        # agent value (lowercased) -> [(pattern length, allow, pattern, compiled)]
+        self._groups: dict[str, list[tuple[int, bool, str, re.Pattern]]] = {}
+        self._parse(text)
+        for rules in self._groups.values():
+            rules.sort(key=lambda r: (-r[0], not r[1]))  # longest first, allow before disallow
+
+    def _parse(self, text: str) -> None:
+        agents: list[str] = []
+        in_rules = False
+        for raw in text.splitlines():
+            line = raw.split("#", 1)[0].strip()
+            field, sep, value = line.partition(":")
+            if not sep:
+                continue
+            field, value = field.strip().lower(), value.strip()
+            if field == "user-agent":
+                if in_rules:
+                    agents, in_rules = [], False
+                agents.append(value.lower())
+                for agent in agents:
+                    self._groups.setdefault(agent, [])
+            elif field in ("allow", "disallow") and agents:
+                in_rules = True
+                if not value:
+                    continue  # "Disallow:" with no path allows everything
+                if not value.startswith(("/", "*")):
+                    value = "/" + value
+                rule = (len(value), field == "allow", value, _compile(value))
+                for agent in agents:
+                    self._groups[agent].append(rule)
+
+    def _rules_for(self, agent: str) -> list[tuple[int, bool, str, re.Pattern]]:
+        token = agent.lower()
+        # An empty "User-agent:" value names no crawler (it would prefix every token)
+        named = [a for a in self._groups if a and a != "*" and token.startswith(a)]
+        if named:
+            return self._groups[max(named, key=len)]
+        if token.startswith(_AGENTS_IGNORING_WILDCARD):
+            return []
+        return self._groups.get("*", [])
+
+    def verdict(self, url: str, agent: str) -> tuple[bool, str | None]:
+        """(allowed, deciding rule such as "Disallow: /lp/") for url and crawler token."""
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        if path == "/robots.txt":
+            return True, None
+        for _, allow, pattern, compiled in self._rules_for(agent):
+            if compiled.match(path):
+                return allow, f"{'Allow' if allow else 'Disallow'}: {pattern}"
+        return True, None
+
+
+def _unknown(origin: str, status_code: int | None, error: str) -> dict:
+    return {"origin": origin, "status_code": status_code, "rules": None, "error": error}
+
+
+class RobotsCache:
+    """Process-wide parsed robots.txt by origin. Only touched from the client loop."""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def get(self, origin: str) -> dict | None:
+        entry = self._entries.get(origin)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(origin, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, robots: dict) -> None:
+        if robots["rules"] is None:
+            return  # unknown — ask again next time
+        self._entries.pop(robots["origin"], None)
+        self._entries[robots["origin"]] = (time.monotonic() + get_settings().robots_cache_ttl, robots)
+        while len(self._entries) > _MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+robots_cache = RobotsCache()
+
+
+async def fetch_robots(origin: str, use_cache: bool = True, timeout: float = FETCH_TIMEOUT) -> dict:
+    """
+    Fetch and parse origin's /robots.txt, through the cache. Never raises.
+    "rules" is a RobotsRules, or None when the file could not be read.
+    """
+    if not use_cache:
+        robots_cache.bypassed += 1
+    elif cached := robots_cache.get(origin):
+        return cached
+    robots = await flights.do(("robots", origin), lambda: _fetch(origin, timeout))
+    robots_cache.put(robots)
+    return robots
+
+
+async def _fetch(origin: str, timeout: float) -> dict:
+    url = f"{origin}/robots.txt"
+    try:
+        async with get_scheduler().slot(url):
+            async with get_http_client().stream(
+                "GET", url, headers={"User-Agent": USER_AGENT}, follow_redirects=True, timeout=timeout,
+            ) as resp:
+                status = resp.status_code
+                if status == 429 or status >= 500:
+                    return _unknown(origin, status, f"robots.txt returned HTTP {status}")
+                if status >= 400:
+                    return {"origin": origin, "status_code": status, "rules": RobotsRules(), "error": None}
+                body, _ = await read_capped(resp, MAX_ROBOTS_BYTES)
+        return {
+            "origin": origin,
+            "status_code": status,
+            "rules": RobotsRules(body.decode("utf-8", errors="replace")),
+            "error": None,
+        }
+    except Exception as exc:
+        if isinstance(exc, httpx.TimeoutException):
+            error = f"Request timed out (>{timeout:g}s)"
+        else:
+            error = str(exc) or exc.__class__.__name__
+        breaker.record(url, exc, error)
+        return _unknown(origin, None, error)
@@ -0,0 +1,62 @@
+"""
+Politeness scheduler for outbound Tier 2 requests.
+
+Every landing page fetch and redirect-trace hop takes a slot here first: at
+most fetch_per_host_concurrency requests in flight per origin host, and at
+most fetch_global_concurrency overall. Both semaphores wake waiters in FIFO
+order, and a request only competes for a global slot once it holds its host
+slot — so one 50-URL domain queues behind its own cap while other hosts
+keep flowing. Lives on the shared HTTP client loop (utils/http_client.py).
+
+A host whose circuit breaker is open (agents/net/breaker.py) gets no slot:
+slot() raises HostUnavailable before queueing and again after the wait, so
+requests queued behind a failing one fail fast too.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from agents.net.breaker import breaker
+from core.config import get_settings
+
+
+class HostScheduler:
+    def __init__(self, per_host: int, global_limit: int):
+        self._per_host = per_host
+        self._global = asyncio.Semaphore(global_limit)
+        # host -> [semaphore, number of holders + waiters]
+        self._hosts: dict[str, list] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        breaker.guard(url)
+        host = (urlsplit(url).netloc or "").lower()
+        entry = self._hosts.setdefault(host, [asyncio.Semaphore(self._per_host), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                breaker.guard(url)
+                async with self._global:
+                    yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._hosts.pop(host, None)
+
+    def stats(self) -> dict:
+        return {
+            "active_hosts": len(self._hosts),
+            "queued_or_running": sum(n for _, n in self._hosts.values()),
+        }
+
+
+_scheduler: HostScheduler | None = None
+
+
+def get_scheduler() -> HostScheduler:
+    """Process-wide scheduler, built from Settings on first use (on the client loop)."""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = HostScheduler(settings.fetch_per_host_concurrency, settings.fetch_global_concurrency)
+    return _scheduler
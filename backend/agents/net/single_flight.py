@@ -0,0 +1,42 @@
+"""
+Process-wide coalescing of identical in-flight requests.
+
+Runs submitted together for the same campaign ask for the same landing pages,
+redirect traces and certificates at the same moment. The first caller for a
+key starts the work as a task; every caller that arrives while it is in
+flight awaits that same task instead of issuing its own request. Waiters are
+shielded, so a run that gives up (run_sync timeout) does not cancel the
+request for the others. Only touched from the shared client loop.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.joined = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.started += 1
+        else:
+            self.joined += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        total = self.started + self.joined
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "joined": self.joined,
+            "coalescing_rate": round(self.joined / total, 3) if total else 0.0,
+        }
+
+
+flights = SingleFlight()
@@ -0,0 +1,136 @@
+"""
+Landing page timing engine.
+
+One request is a noisy measurement, so each URL is sampled timing_samples
+times on a cold connection (fresh DNS lookup, TCP connect and TLS handshake,
+through a throwaway client) and as many times on a warm one (kept-alive
+connection from the shared pool). The run's own page fetch has already
+warmed the pool and counts as the first warm sample (total only, no phases).
+Samples for one URL run one after another; URLs are measured concurrently,
+within the per-host scheduler caps.
+
+httpcore trace events split every sample into phases:
+
+    dns       name resolution (cold samples only)
+    connect   TCP connect
+    tls       TLS handshake
+    ttfb      request sent -> response headers received
+    download  response headers -> end of body (capped at fetch_max_bytes)
+
+Redirect hops add to the same phases. Each URL reports p50 / p95 of the total
+and p50 per phase, for cold and warm samples separately.
+"""
+import asyncio
+import socket
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from agents.net.breaker import breaker
+from agents.net.fetch import FETCH_TIMEOUT, PAGE_HEADERS, read_capped
+from agents.net.scheduler import get_scheduler
+from core.config import get_settings
+from core.models import FetchedPage
+from utils.dns_cache import dns_cache
+from utils.http_client import get_http_client, new_cold_client
+
+PHASES = ("dns", "connect", "tls", "ttfb", "download")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class _PhaseTrace:
+    """httpcore "trace" extension callback that accumulates phase durations (ms)."""
+
+    def __init__(self):
+        self.ms = dict.fromkeys(PHASES, 0.0)
+        self._started: dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        now = time.monotonic()
+        step, _, state = event_name.rpartition(".")
+        step = step.split(".", 1)[-1]  # "http11.send_request_headers" -> "send_request_headers"
+        if state == "started":
+            self._started[step] = now
+        elif state == "complete":
+            if step == "connect_tcp":
+                self.ms["connect"] += (now - self._started.pop(step, now)) * 1000
+            elif step == "start_tls":
+                self.ms["tls"] += (now - self._started.pop(step, now)) * 1000
+            elif step == "receive_response_headers":
+                sent = self._started.pop("send_request_headers", now)
+                self.ms["ttfb"] += (now - sent) * 1000
+
+
+async def _sample(url: str, client, cold: bool, timeout: float) -> dict:
+    host = urlsplit(url).hostname or ""
+    trace = _PhaseTrace()
+    if cold:
+        # Time a real lookup, then make sure the connect phase finds it cached
+        start = time.monotonic()
+        await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        trace.ms["dns"] = (time.monotonic() - start) * 1000
+        await dns_cache.resolve(host)
+
+    start = time.monotonic()
+    async with client.stream(
+        "GET", url, headers=PAGE_HEADERS, follow_redirects=True, timeout=timeout, extensions={"trace": trace},
+    ) as resp:
+        headers_at = time.monotonic()
+        await read_capped(resp, get_settings().fetch_max_bytes)
+    end = time.monotonic()
+    trace.ms["download"] = (end - headers_at) * 1000
+    return {"total": trace.ms["dns"] + (end - start) * 1000, **trace.ms}
+
+
+def _summary(samples: list[dict]) -> dict:
+    totals = [s["total"] for s in samples]
+    traced = [s for s in samples if "ttfb" in s]
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(totals, 50)),
+        "p95_ms": round(percentile(totals, 95)),
+        "phases_p50_ms": {p: round(percentile([s[p] for s in traced], 50)) for p in PHASES} if traced else {},
+    }
+
+
+async def measure_page(url: str, page: FetchedPage | None = None, timeout: float = FETCH_TIMEOUT) -> dict:
+    """
+    Cold and warm timing summaries for one URL. Never raises.
+    page is the run's fetch of url, if any: a full network fetch is reused as a warm sample.
+    """
+    samples = max(get_settings().timing_samples, 1)
+    cold: list[dict] = []
+    warm: list[dict] = []
+    if page is not None and page.ok and page.source == "network":
+        warm.append({"total": float(page.elapsed_ms)})
+    scheduler = get_scheduler()
+    try:
+        for _ in range(samples):
+            async with scheduler.slot(url):
+                async with new_cold_client() as client:
+                    cold.append(await _sample(url, client, cold=True, timeout=timeout))
+            if len(warm) < samples:
+                async with scheduler.slot(url):
+                    warm.append(await _sample(url, get_http_client(), cold=False, timeout=timeout))
+    except Exception as exc:
+        if isinstance(exc, httpx.TimeoutException):
+            error = f"Request timed out (>{timeout:g}s)"
+        else:
+            error = str(exc) or exc.__class__.__name__
+        breaker.record(url, exc, error)
+        if not cold:
+            return {"url": url, "error": error}
+        # Keep what was measured before the failure
+    result = {"url": url, "cold": _summary(cold)}
+    if warm:
+        result["warm"] = _summary(warm)
+    return result
@@ -0,0 +1,156 @@
+"""
+Async TLS certificate probe.
+
+Produces the certificate facts the SSL checks need (validity, expiry,
+days left) for many hosts concurrently on the shared client loop. When a
+landing page fetch already completed a verified TLS handshake with the host,
+the certificate is read from that connection instead (FetchedPage.cert) and
+no extra handshake is made.
+
+Facts are also kept in a process-wide CertCache keyed by hostname, so
+repeat runs against the same client domains skip the handshake. The TTL
+shrinks as days_left approaches WARN_DAYS / FAIL_DAYS, so a renewal or a
+threshold crossing is picked up promptly.
+"""
+import asyncio
+import ssl
+import time
+from datetime import datetime, timezone
+
+from agents.net.breaker import HostUnavailable, breaker
+from agents.net.scheduler import get_scheduler
+from agents.net.single_flight import flights
+from core.config import get_settings
+from utils.dns_cache import dns_cache
+
+PROBE_TIMEOUT = 8  # seconds
+
+WARN_DAYS = 30   # warn if cert expires within 30 days
+FAIL_DAYS = 7    # fail if cert expires within 7 days
+
+_DAY = 86_400
+_WARN_ZONE_MAX_TTL = 3_600     # inside the warn window: re-check hourly
+_FAIL_ZONE_TTL = 600           # about to expire / expired: every 10 minutes
+_INVALID_TTL = 300             # invalid certs get fixed — don't hold them long
+_MAX_ENTRIES = 10_000
+
+
+def cert_facts(hostname: str, cert: dict | None) -> dict:
+    """Turn a verified peer certificate (ssl.getpeercert() dict) into check facts."""
+    if not cert:
+        return {"hostname": hostname, "valid": False, "days_left": None, "expiry": None, "error": "Empty cert"}
+    not_after = str(cert.get("notAfter", ""))
+    expiry = datetime.strptime(not_after, "%b %d %H:%M:%S %Y %Z").replace(tzinfo=timezone.utc)
+    days_left = (expiry - datetime.now(timezone.utc)).days
+    return {
+        "hostname": hostname,
+        "valid": True,
+        "days_left": days_left,
+        "expiry": expiry.strftime("%Y-%m-%d"),
+        "error": None,
+    }
+
+
+def _failure(hostname: str, valid: bool | None, error: str) -> dict:
+    return {"hostname": hostname, "valid": valid, "days_left": None, "expiry": None, "error": error}
+
+
+def cert_ttl(facts: dict, max_ttl: int) -> int:
+    """Seconds a certificate's facts stay cacheable — until the next threshold, capped."""
+    if facts.get("valid") is not True or facts.get("days_left") is None:
+        return _INVALID_TTL
+    days_left = facts["days_left"]
+    if days_left <= FAIL_DAYS:
+        return _FAIL_ZONE_TTL
+    if days_left <= WARN_DAYS:
+        return max(_FAIL_ZONE_TTL, min(_WARN_ZONE_MAX_TTL, (days_left - FAIL_DAYS) * _DAY))
+    return max(_FAIL_ZONE_TTL, min(max_ttl, (days_left - WARN_DAYS) * _DAY))
+
+
+class CertCache:
+    """Process-wide certificate facts by hostname. Only touched from the client loop."""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def get(self, hostname: str) -> dict | None:
+        entry = self._entries.get(hostname)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(hostname, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, facts: dict) -> None:
+        # Connection errors say nothing about the certificate — never cache them
+        if facts.get("valid") is None:
+            return
+        ttl = cert_ttl(facts, get_settings().cert_cache_max_ttl)
+        self._entries.pop(facts["hostname"], None)
+        self._entries[facts["hostname"]] = (time.monotonic() + ttl, facts)
+        while len(self._entries) > _MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+cert_cache = CertCache()
+
+
+async def _connect(hostname: str, port: int):
+    """TLS-connect to the first reachable address of hostname (resolved via the DNS cache)."""
+    addresses = await dns_cache.resolve(hostname)
+    last_exc: OSError | None = None
+    for address in addresses:
+        try:
+            return await asyncio.open_connection(
+                address, port, ssl=ssl.create_default_context(), server_hostname=hostname,
+            )
+        except ssl.SSLError:
+            raise
+        except OSError as exc:
+            last_exc = exc
+    raise last_exc
+
+
+async def probe_cert(hostname: str, port: int = 443, timeout: float = PROBE_TIMEOUT) -> dict:
+    """Handshake with hostname:port and return its certificate facts. Never raises."""
+    # Concurrent runs probing the same host share one handshake
+    return await flights.do(("cert", hostname, port), lambda: _probe(hostname, port, timeout))
+
+
+async def _probe(hostname: str, port: int, timeout: float) -> dict:
+    writer = None
+    target = f"https://{hostname}:{port}/"
+    try:
+        async with get_scheduler().slot(target):
+            _, writer = await asyncio.wait_for(_connect(hostname, port), timeout=timeout)
+        return cert_facts(hostname, writer.get_extra_info("peercert"))
+    except ssl.SSLCertVerificationError as exc:
+        return _failure(hostname, False, f"Invalid cert: {exc}")
+    except ssl.SSLError as exc:
+        return _failure(hostname, False, f"SSL error: {exc}")
+    except HostUnavailable as exc:
+        return _failure(hostname, None, str(exc))
+    except (OSError, asyncio.TimeoutError) as exc:
+        # Port 443 not open, or connection refused — skip gracefully
+        error = f"Connection error: {exc or 'timed out'}"
+        breaker.record(target, exc, error)
+        return _failure(hostname, None, error)
+    except Exception as exc:
+        return _failure(hostname, None, str(exc))
+    finally:
+        if writer is not None:
+            writer.close()
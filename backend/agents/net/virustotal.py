@@ -0,0 +1,339 @@
+"""
+VirusTotal domain reputation: cache, quota-aware queue and lookups.
+
+The free API tier allows virustotal_requests_per_minute (4) and
+virustotal_daily_quota (500) requests, and the same client domains come back
+on every run. So:
+
+- Reports are cached for virustotal_cache_ttl_hours, in memory and in the
+  Supabase domain_reputation table (shared across runs, tenants and restarts).
+- Misses go into one process-wide priority queue drained by a token bucket
+  sized to the per-minute quota. Interactive runs are served before scheduled
+  and API runs; a domain already queued or in flight is never requested twice.
+- A 429 empties the bucket for a minute and re-queues the domain instead of
+  becoming an error result.
+- Checks wait a bounded time (virustotal_max_wait). Lookups still queued
+  after that keep going in the background and warm the cache for the next run.
+
+The queue and bucket live on the shared client loop; the cache is thread-safe.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.config import get_settings
+from utils.http_client import get_http_client, run_sync
+
+logger = logging.getLogger(__name__)
+
+_API_URL = "https://www.virustotal.com/api/v3/domains/{domain}"
+_RATE_LIMIT_BACKOFF = 60  # seconds the bucket stays empty after a 429
+
+INTERACTIVE, BATCH = 0, 1  # queue priorities — lower is served first
+
+
+class RateLimited(Exception):
+    pass
+
+
+async def _query(domain: str, api_key: str) -> dict:
+    """Query the VirusTotal v3 domain report. Raises RateLimited on 429."""
+    try:
+        resp = await get_http_client().get(
+            _API_URL.format(domain=domain), headers={"x-apikey": api_key}, timeout=10,
+        )
+        if resp.status_code == 404:
+            return {"domain": domain, "malicious": 0, "suspicious": 0, "status": "unknown"}
+        if resp.status_code == 429:
+            raise RateLimited()
+        resp.raise_for_status()
+        data = resp.json()
+        stats = data.get("data", {}).get("attributes", {}).get("last_analysis_stats", {})
+        return {
+            "domain": domain,
+            "malicious": stats.get("malicious", 0),
+            "suspicious": stats.get("suspicious", 0),
+            "harmless": stats.get("harmless", 0),
+            "status": "ok",
+        }
+    except RateLimited:
+        raise
+    except Exception as exc:
+        return {"domain": domain, "error": str(exc)}
+
+
+# ---------------------------------------------------------------------------
+# Reputation cache
+# ---------------------------------------------------------------------------
+
+class ReputationCache:
+    """Domain reports by domain, in memory with a Supabase table behind it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, dict]] = {}  # domain -> (expires_at epoch, result)
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _ttl() -> float:
+        return get_settings().virustotal_cache_ttl_hours * 3600
+
+    def get_many(self, domains: list[str]) -> dict[str, dict]:
+        """Cached reports for the domains that have one. Call from a worker thread."""
+        now = time.time()
+        found: dict[str, dict] = {}
+        with self._lock:
+            for domain in domains:
+                entry = self._entries.get(domain)
+                if entry and entry[0] > now:
+                    found[domain] = entry[1]
+        self.hits += len(found)
+
+        missing = [d for d in domains if d not in found]
+        if missing:
+            from_db = self._load(missing)
+            self.db_hits += len(from_db)
+            with self._lock:
+                for domain, (expires, result) in from_db.items():
+                    self._entries[domain] = (expires, result)
+                    found[domain] = result
+        self.misses += len(domains) - len(found)
+        return found
+
+    def put(self, result: dict) -> None:
+        """Remember a successful report (errors are never cached) and persist it."""
+        if "error" in result:
+            return
+        with self._lock:
+            self._entries[result["domain"]] = (time.time() + self._ttl(), result)
+        self._save(result)
+
+    def _load(self, domains: list[str]) -> dict[str, tuple[float, dict]]:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._ttl())
+        try:
+            from db.supabase_client import get_supabase_admin
+            rows = (
+                get_supabase_admin().table("domain_reputation")
+                .select("domain,result,checked_at")
+                .in_("domain", domains)
+                .gte("checked_at", cutoff.isoformat())
+                .execute()
+            ).data or []
+        except Exception as exc:
+            logger.warning("domain_reputation read skipped: %s", exc)
+            return {}
+        loaded = {}
+        for row in rows:
+            checked_at = datetime.fromisoformat(row["checked_at"].replace("Z", "+00:00"))
+            loaded[row["domain"]] = (checked_at.timestamp() + self._ttl(), row["result"])
+        return loaded
+
+    @staticmethod
+    def _save(result: dict) -> None:
+        try:
+            from db.supabase_client import get_supabase_admin
+            get_supabase_admin().table("domain_reputation").upsert({
+                "domain": result["domain"],
+                "result": result,
+                "checked_at": datetime.now(timezone.utc).isoformat(),
+            }).execute()
+        except Exception as exc:
+            logger.warning("domain_reputation write skipped: %s", exc)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "db_hits": self.db_hits, "misses": self.misses}
+
+
+reputation_cache = ReputationCache()
+
+
+# ---------------------------------------------------------------------------
+# Quota-aware lookup queue (client loop only)
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def take(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds: float) -> None:
+        """Server said slow down: spend nothing for `seconds`, then refill from empty."""
+        self.tokens = 0.0
+        self._blocked_until = time.monotonic() + seconds
+        self._updated = self._blocked_until
+
+    def headroom(self) -> float:
+        if time.monotonic() < self._blocked_until:
+            return 0.0
+        self._refill()
+        return round(self.tokens, 2)
+
+
+class LookupQueue:
+    def __init__(self):
+        settings = get_settings()
+        self._bucket = TokenBucket(settings.virustotal_requests_per_minute)
+        self._daily_quota = settings.virustotal_daily_quota
+        self._heap: list[tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._pending: dict[str, asyncio.Future] = {}  # queued or in flight, by domain
+        self._priority: dict[str, int] = {}             # most urgent priority asked for, by domain
+        self._dispatched: set[str] = set()              # in flight
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self._day = datetime.now(timezone.utc).date()
+        self.used_today = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.coalesced = 0
+
+    def request(self, domain: str, priority: int) -> asyncio.Future:
+        """Future for domain's report, queued once however many runs ask."""
+        future = self._pending.get(domain)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[domain] = future
+        self._priority[domain] = min(priority, self._priority.get(domain, priority))
+        # A duplicate entry lets an interactive request overtake an earlier batch one;
+        # stale entries are skipped when popped
+        heapq.heappush(self._heap, (priority, next(self._seq), domain))
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        return future
+
+    def _is_live(self, domain: str) -> bool:
+        return domain in self._pending and domain not in self._dispatched
+
+    def _pop_live(self) -> str | None:
+        while self._heap:
+            _, _, domain = heapq.heappop(self._heap)
+            if self._is_live(domain):
+                return domain
+        return None
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not any(self._is_live(d) for _, _, d in self._heap):
+                self._heap.clear()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await self._bucket.take()
+            # Pick after the wait, so interactive requests that arrived meanwhile go first
+            domain = self._pop_live()
+            if domain is None:
+                continue
+            self._dispatched.add(domain)
+            asyncio.ensure_future(self._lookup(domain))
+
+    async def _lookup(self, domain: str) -> None:
+        future = self._pending[domain]
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            self._day, self.used_today = today, 0
+        if self.used_today >= self._daily_quota:
+            result = {"domain": domain, "error": "VirusTotal daily quota exhausted"}
+        else:
+            self.used_today += 1
+            self.requests += 1
+            try:
+                result = await _query(domain, get_settings().virustotal_api_key)
+            except RateLimited:
+                self.rate_limited += 1
+                self._bucket.block(_RATE_LIMIT_BACKOFF)
+                self._dispatched.discard(domain)
+                # Back in line at the priority it was asked for — a batch lookup must not jump the queue
+                heapq.heappush(self._heap, (self._priority.get(domain, BATCH), next(self._seq), domain))
+                self._wakeup.set()
+                return
+        # Persisting is a blocking Supabase call — keep it off the loop
+        await asyncio.get_running_loop().run_in_executor(None, reputation_cache.put, result)
+        self._pending.pop(domain, None)
+        self._priority.pop(domain, None)
+        self._dispatched.discard(domain)
+        future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "quota_headroom": self._bucket.headroom(),
+            "per_minute": self._bucket.capacity,
+            "daily_remaining": max(self._daily_quota - self.used_today, 0),
+            "queued": sum(1 for d in self._pending if self._is_live(d)),
+            "in_flight": len(self._dispatched),
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "coalesced": self.coalesced,
+        }
+
+
+_queue: LookupQueue | None = None
+
+
+def _get_queue() -> LookupQueue:
+    global _queue
+    if _queue is None:
+        _queue = LookupQueue()
+    return _queue
+
+
+async def _wait_for(domains: list[str], priority: int, timeout: float) -> dict[str, dict]:
+    queue = _get_queue()
+    futures = {d: queue.request(d, priority) for d in domains}
+    # asyncio.wait never cancels — unfinished lookups keep warming the cache
+    await asyncio.wait(futures.values(), timeout=timeout)
+    return {d: f.result() for d, f in futures.items() if f.done()}
+
+
+def lookup_domains(domains: list[str], interactive: bool = True) -> list[dict]:
+    """
+    Reputation report per domain (in order). Call from a worker thread. Never raises.
+
+    Domains not answered within virustotal_max_wait come back with
+    status "pending" and no verdict.
+    """
+    found = reputation_cache.get_many(domains)
+    missing = [d for d in domains if d not in found]
+    if missing:
+        max_wait = get_settings().virustotal_max_wait
+        priority = INTERACTIVE if interactive else BATCH
+        try:
+            found.update(run_sync(_wait_for(missing, priority, max_wait), timeout=max_wait + 5))
+        except Exception as exc:
+            logger.warning("VirusTotal lookup wait failed: %s", exc)
+    return [
+        found.get(d) or {"domain": d, "status": "pending", "error": "queued — VirusTotal quota reached, result cached for the next run"}
+        for d in domains
+    ]
+
+
+def stats() -> dict:
+    return {"cache": reputation_cache.stats(), "queue": _queue.stats() if _queue else None}
@@ -15,6 +15,7 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 
+from agents.net.page_store import get_page_store
 from agents.pipeline import (
     run_tier1_checks,
     run_tier2_background,
@@ -101,8 +102,13 @@ async def pub_create_run(
         headline=payload.headline,
         primary_text=payload.primary_text,
         description=payload.description,
+        force_refresh=payload.force_refresh,
+        interactive=False,  # programmatic runs queue behind UI runs for shared quotas
     )
 
+    # Start Tier 2 network work (DNS, connections, page fetches) while Tier 1 and the DB writes run
+    get_page_store(ctx).warm_up([u.raw_url for u in parsed_urls])
+
     run_row = {
         "user_id": user_id,
         "run_name": payload.run_name,
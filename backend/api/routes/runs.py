@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 
+from agents.net.page_store import get_page_store
 from agents.pipeline import (
     run_tier1_checks,
     run_tier2_background,
@@ -68,8 +69,13 @@ async def create_run(
         headline=payload.headline,
         primary_text=payload.primary_text,
         description=payload.description,
+        force_refresh=payload.force_refresh,
+        interactive=not user.get("scheduled", False),
     )
 
+    # Start Tier 2 network work (DNS, connections, page fetches) while Tier 1 and the DB writes run
+    get_page_store(ctx).warm_up([u.raw_url for u in parsed_urls])
+
     # Insert qa_run row
     run_row = {
         "user_id": user_id,
@@ -255,9 +261,10 @@ async def list_runs(user: dict = Depends(get_current_user)):
 async def rerun(
     run_id: str,
     background_tasks: BackgroundTasks,
+    force_refresh: bool = False,
     user: dict = Depends(get_current_user),
 ):
-    """Create a new run using the same input as an existing run."""
+    """Create a new run using the same input as an existing run; force_refresh skips cross-run caches."""
     db = get_supabase_admin()
     original = db.table("qa_runs").select(
         "run_name,platform,raw_input,industry_vertical,campaign_objective"
@@ -288,6 +295,7 @@ async def rerun(
         headline=raw.get("headline"),
         primary_text=raw.get("primary_text"),
         description=raw.get("description"),
+        force_refresh=force_refresh,
     )
 
     return await create_run(rebuild, background_tasks, user)
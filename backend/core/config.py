@@ -14,9 +14,49 @@ class Settings(BaseSettings):
     environment: str = "development"
     cors_origins: str = "http://localhost:5173"
     virustotal_api_key: str = ""
+    # Bearer token for the internal /metrics endpoint; empty = endpoint disabled
+    metrics_token: str = ""
     resend_api_key: str = ""
     notify_email_from: str = "LaunchProof <noreply@launchproof.io>"
     app_base_url: str = "https://launchproof.io"
+    # Shared outbound HTTP client pool (utils/http_client.py)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = True
+    # Per-response body budget for landing page fetches, enforced while streaming
+    fetch_max_bytes: int = 2_000_000
+    # Politeness caps for Tier 2 fetches (agents/net/scheduler.py)
+    fetch_per_host_concurrency: int = 4
+    fetch_global_concurrency: int = 32
+    # Cross-run TLS certificate cache — upper bound on TTL (seconds)
+    cert_cache_max_ttl: int = 6 * 3600
+    # Cross-run landing page cache (agents/net/page_cache.py)
+    page_cache_max_bytes: int = 64_000_000
+    page_cache_max_age: int = 24 * 3600  # seconds
+    # How long a host that failed to connect is skipped by other runs (seconds)
+    host_breaker_ttl: int = 60
+    # Shared DNS cache lifetime per host (getaddrinfo exposes no record TTLs)
+    dns_cache_ttl: int = 300
+    dns_cache_max_hosts: int = 4096  # LRU bound on cached hosts
+    # VirusTotal quota and reputation cache (agents/net/virustotal.py)
+    virustotal_requests_per_minute: int = 4
+    virustotal_daily_quota: int = 500
+    virustotal_cache_ttl_hours: int = 24
+    virustotal_max_wait: int = 25  # seconds a check waits for queued lookups
+    # Offline malware/phishing domain lists (agents/net/blocklist.py); empty = disabled
+    blocklist_dir: str = ""
+    blocklist_reload_interval: int = 60  # seconds between directory re-scans
+    # Page timing samples per URL, each on a cold and a warm connection (agents/net/timing.py)
+    timing_samples: int = 3
+    timing_max_urls: int = 10  # pages measured per run, one per host + path
+    # Cross-run GTM container cache lifetime (agents/net/gtm.py), seconds
+    gtm_cache_ttl: int = 3600
+    # Cross-run robots.txt cache lifetime per origin (agents/net/robots.py), seconds
+    robots_cache_ttl: int = 3600
+    # Tracking signature catalog file (utils/signatures.py); empty = bundled signatures.json
+    signature_catalog_path: str = ""
+    signature_reload_interval: int = 30  # seconds between file change checks
 
     @property
     def cors_origins_list(self) -> list[str]:
@@ -1,9 +1,17 @@
-from pydantic import BaseModel, HttpUrl, field_validator
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, HttpUrl, PrivateAttr, field_validator
 from typing import Optional, Any
 from enum import Enum
 from datetime import datetime
 import uuid
 
+from utils.bot_challenge import detect_challenge
+from utils.charset import detect_charset
+from utils.page_facts import extract_facts
+from utils.phrases import tokenize
+from utils.signatures import SignatureHits, signature_catalog
+from utils.vendors import VendorInventory
+
 
 # ── Enums ─────────────────────────────────────────────────────────────────────
 
@@ -70,6 +78,102 @@ class RunContext(BaseModel):
     description: Optional[str] = None
     # Raw metadata passed through
     extra: dict[str, Any] = {}
+    # Skip cross-run caches (certificates, pages) and re-read everything from the network
+    force_refresh: bool = False
+    # A user is waiting on this run (UI); scheduled and API runs yield shared quotas to it
+    interactive: bool = True
+    # Per-run landing page store (agents.net.page_store) — never serialized
+    _page_store: Any = PrivateAttr(default=None)
+
+
+class FormFacts(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    action: str = ""
+    method: str = "get"
+    fields: tuple[str, ...] = ()               # name of each input / select / textarea / button
+
+
+class AnchorFacts(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    href: str
+    text: str = ""                             # visible text, whitespace collapsed
+
+
+class PageFacts(BaseModel):
+    """What the content checks read from a page's HTML, extracted in one pass (utils.page_facts)."""
+    model_config = ConfigDict(frozen=True)
+    title: str = ""
+    meta: dict[str, tuple[str, ...]] = {}      # lower-cased name / property / http-equiv -> contents
+    links: dict[str, tuple[str, ...]] = {}     # lower-cased rel token -> hrefs
+    script_srcs: tuple[str, ...] = ()
+    iframe_srcs: tuple[str, ...] = ()
+    inline_scripts: tuple[str, ...] = ()       # sha256 prefix of each inline script body
+    forms: tuple[FormFacts, ...] = ()
+    anchors: tuple[AnchorFacts, ...] = ()
+    text: str = ""                             # visible text, whitespace collapsed (MAX_TEXT_CHARS)
+    truncated: bool = False                    # HTML past MAX_PARSE_CHARS was not parsed
+
+    def meta_content(self, key: str) -> str:
+        """First non-empty content for a meta name / property, stripped ("" if none)."""
+        return next((c.strip() for c in self.meta.get(key, ()) if c.strip()), "")
+
+
+class FetchedPage(BaseModel):
+    """One landing page fetch, shared by every Tier 2 check in a run."""
+    url: str                                   # URL as requested
+    final_url: str = ""                        # URL after redirects
+    status_code: Optional[int] = None
+    headers: dict[str, str] = {}               # lower-cased header names
+    redirects: list[str] = []                  # intermediate URLs, in hop order
+    elapsed_ms: int = 0
+    body: bytes = b""                          # capped at fetch_max_bytes
+    truncated: bool = False                    # budget hit before the end of the body
+    cert: Optional[dict[str, Any]] = None      # TLS facts for the final host (agents.net.tls)
+    source: str = "network"                    # "cache" when a 304 revalidated the cross-run copy
+    error: Optional[str] = None                # transport error (DNS, timeout, TLS...)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and 200 <= self.status_code < 400
+
+    @cached_property
+    def challenge(self) -> Optional[str]:
+        """Bot-protection vendor when this is a challenge / WAF block page (classified once)."""
+        if self.error:
+            return None
+        return detect_challenge(self.status_code, self.headers, self.body)
+
+    @cached_property
+    def charset(self) -> str:
+        return detect_charset(self.body, self.headers.get("content-type", ""))
+
+    @cached_property
+    def html(self) -> str:
+        """Body decoded once per page with the charset from BOM, header or <meta>."""
+        return self.body.decode(self.charset, errors="replace")
+
+    @cached_property
+    def signature_hits(self) -> SignatureHits:
+        """Pixel / GTM / conversion / consent signature hits, from one scan of the body."""
+        body = self.body
+        if self.charset.startswith("utf-16"):
+            body = self.html.encode("utf-8")  # the scanner works on ASCII-compatible bytes
+        return signature_catalog().scan(body)
+
+    @cached_property
+    def facts(self) -> PageFacts:
+        """Title, meta, links, scripts, forms and anchors, parsed once per page."""
+        return PageFacts(**extract_facts(self.html))
+
+    @cached_property
+    def vendor_inventory(self) -> VendorInventory:
+        """Known vendors among the page's script / iframe / preconnect origins."""
+        return signature_catalog().inventory(self.facts, self.final_url or self.url)
+
+    @cached_property
+    def text_tokens(self) -> list[str]:
+        """Visible text as phrase-matcher tokens (utils.phrases)."""
+        return tokenize(self.facts.text)
 
 
 class CheckResult(BaseModel):
@@ -105,6 +209,7 @@ class CreateRunRequest(BaseModel):
     headline: Optional[str] = None
     primary_text: Optional[str] = None
     description: Optional[str] = None
+    force_refresh: bool = False  # bypass cross-run caches for this run
 
     @field_validator("urls")
     @classmethod
@@ -8,11 +8,13 @@ import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from core.config import get_settings
 from db.supabase_client import get_supabase_admin
+from utils.auth import require_metrics_token
+from utils.http_client import close_http_client, start_http_client
 from api.routes import runs, reports, checks, stripe_webhook, profile, api_keys, public_api
 
 logger = logging.getLogger(__name__)
@@ -24,11 +26,12 @@ _INTERVAL_DELTAS = {
 }
 
 
-def _run_scheduled_reruns() -> None:
+def _run_scheduled_reruns(force_refresh: bool = False) -> None:
     """
     Background thread — wakes every 15 minutes and fires scheduled re-runs.
     For each qa_run where next_run_at <= now() and schedule_interval IS NOT NULL,
     triggers a re-run using the existing raw_input and advances next_run_at.
+    force_refresh makes every scheduled run skip the cross-run caches.
     """
     from fastapi import BackgroundTasks
     from api.routes.runs import create_run, rerun as _rerun_endpoint
@@ -64,8 +67,9 @@ def _run_scheduled_reruns() -> None:
                         headline=raw.get("headline"),
                         primary_text=raw.get("primary_text"),
                         description=raw.get("description"),
+                        force_refresh=force_refresh,
                     )
-                    user_ctx = {"user_id": user_id}
+                    user_ctx = {"user_id": user_id, "scheduled": True}
                     import asyncio
                     bt = BackgroundTasks()
                     asyncio.run(create_run(payload, bt, user_ctx))
@@ -83,30 +87,36 @@ def _run_scheduled_reruns() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup: recover stalled runs and refresh benchmark materialized view."""
-    db = get_supabase_admin()
-    # 1. Recover stalled runs from server restarts
+    # 0. Shared outbound HTTP client pool (checks + notifications)
+    start_http_client()
+    print("[startup] HTTP client pool started")
     try:
-        cutoff = (datetime.now(timezone.utc) - timedelta(minutes=10)).isoformat()
-        stalled = db.table("qa_runs").select("id").eq("status", "running").lt("started_at", cutoff).execute()
-        if stalled.data:
-            ids = [r["id"] for r in stalled.data]
-            db.table("qa_runs").update({
-                "status": "failed",
-                "error_message": "Server restart during run — please resubmit",
-            }).in_("id", ids).execute()
-            print(f"[startup] Recovered {len(ids)} stalled run(s)")
-    except Exception as e:
-        print(f"[startup] Stall recovery skipped: {e}")
-    # 2. Refresh benchmark materialized view (safe: no-ops if too few tenants)
-    try:
-        db.rpc("refresh_benchmark_view", {}).execute()
-        print("[startup] Benchmark view refreshed")
-    except Exception as e:
-        print(f"[startup] Benchmark refresh skipped: {e}")
-    # 3. Start scheduled re-run background thread
-    threading.Thread(target=_run_scheduled_reruns, daemon=True).start()
-    print("[startup] Scheduled re-run thread started")
-    yield
+        db = get_supabase_admin()
+        # 1. Recover stalled runs from server restarts
+        try:
+            cutoff = (datetime.now(timezone.utc) - timedelta(minutes=10)).isoformat()
+            stalled = db.table("qa_runs").select("id").eq("status", "running").lt("started_at", cutoff).execute()
+            if stalled.data:
+                ids = [r["id"] for r in stalled.data]
+                db.table("qa_runs").update({
+                    "status": "failed",
+                    "error_message": "Server restart during run — please resubmit",
+                }).in_("id", ids).execute()
+                print(f"[startup] Recovered {len(ids)} stalled run(s)")
+        except Exception as e:
+            print(f"[startup] Stall recovery skipped: {e}")
+        # 2. Refresh benchmark materialized view (safe: no-ops if too few tenants)
+        try:
+            db.rpc("refresh_benchmark_view", {}).execute()
+            print("[startup] Benchmark view refreshed")
+        except Exception as e:
+            print(f"[startup] Benchmark refresh skipped: {e}")
+        # 3. Start scheduled re-run background thread
+        threading.Thread(target=_run_scheduled_reruns, daemon=True).start()
+        print("[startup] Scheduled re-run thread started")
+        yield
+    finally:
+        close_http_client()
 
 
 settings = get_settings()
@@ -137,3 +147,30 @@ app.include_router(public_api.router)
 @app.get("/health")
 async def health():
     return {"status": "ok", "service": "qa-tool-backend"}
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+async def metrics():
+    """Process-level cache and fetch counters (reset on restart). Operators only (METRICS_TOKEN)."""
+    from agents.net.breaker import breaker
+    from agents.net.page_cache import page_cache
+    from agents.net.single_flight import flights
+    from agents.net import virustotal
+    from agents.net.blocklist import blocklists
+    from agents.net.gtm import gtm_cache
+    from agents.net.robots import robots_cache
+    from agents.net.tls import cert_cache
+    from utils.signatures import catalog_loader
+    from utils.dns_cache import dns_cache
+    return {
+        "dns_cache": dns_cache.stats(),
+        "single_flight": flights.stats(),
+        "host_breaker": breaker.stats(),
+        "virustotal": virustotal.stats(),
+        "blocklists": blocklists.stats(),
+        "cert_cache": cert_cache.stats(),
+        "page_cache": page_cache.stats(),
+        "gtm_containers": gtm_cache.stats(),
+        "robots": robots_cache.stats(),
+        "signature_catalog": catalog_loader.stats(),
+    }
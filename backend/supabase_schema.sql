@@ -232,3 +232,13 @@ EXCEPTION WHEN OTHERS THEN
   NULL; -- silently skip if view is empty or can't refresh concurrently yet
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- VirusTotal domain reputation cache — shared across tenants, written by the
+-- service role only (no RLS policies). Rows older than the configured TTL are ignored.
+CREATE TABLE IF NOT EXISTS domain_reputation (
+  domain      text PRIMARY KEY,
+  result      jsonb NOT NULL,
+  checked_at  timestamptz NOT NULL DEFAULT now()
+);
+
+ALTER TABLE domain_reputation ENABLE ROW LEVEL SECURITY;
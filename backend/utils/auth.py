@@ -1,11 +1,16 @@
 """
 JWT auth middleware — validates Supabase-issued JWTs via Supabase API.
+Internal operator endpoints (/metrics) use a static bearer token instead.
 """
+import secrets
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from core.config import get_settings
 from db.supabase_client import get_supabase
 
 bearer_scheme = HTTPBearer()
+_optional_bearer = HTTPBearer(auto_error=False)
 
 
 def get_current_user(
@@ -22,3 +27,14 @@ def get_current_user(
         raise
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+
+def require_metrics_token(
+    credentials: HTTPAuthorizationCredentials | None = Security(_optional_bearer),
+) -> None:
+    """Internal endpoints: 404 unless METRICS_TOKEN is set, 401 unless it is presented."""
+    expected = get_settings().metrics_token
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(credentials.credentials, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
@@ -0,0 +1,66 @@
+"""
+Bot-challenge / WAF-block page classification.
+
+A landing page behind Cloudflare, Akamai, Imperva, DataDome, PerimeterX,
+AWS WAF or Sucuri may answer our fetch with an interstitial instead of the
+page. Its HTML has no pixel, canonical or OG tags, so checks that parse it
+report misleading failures. This classifies a response once from its status,
+headers and the first SNIFF_BYTES of the body.
+
+Body markers only count on block statuses (403/429/503, plus 202/405 for AWS
+WAF), except for a few that only ever appear on challenge pages.
+"""
+SNIFF_BYTES = 16_384
+
+_BLOCK_STATUSES = {403, 429, 503}
+
+# (vendor, header name, substring in header value) — set only on challenge responses
+_HEADER_SIGNS = [
+    ("Cloudflare", "cf-mitigated", "challenge"),
+    ("AWS WAF", "x-amzn-waf-action", "challenge"),
+    ("AWS WAF", "x-amzn-waf-action", "captcha"),
+]
+
+# (vendor, server header substring, body markers) — need a block status
+_BLOCK_PAGE_SIGNS = [
+    ("Cloudflare", "cloudflare", (b"just a moment...", b"attention required! | cloudflare", b"cf-browser-verification", b"/cdn-cgi/challenge-platform/")),
+    ("Akamai", "akamaighost", (b"access denied", b"reference&#32;&#35;", b"errors.edgesuite.net")),
+    ("Imperva", "", (b"_incapsula_resource", b"incapsula incident id")),
+    ("Sucuri", "sucuri", (b"sucuri website firewall", b"access denied - sucuri")),
+    ("PerimeterX", "", (b"px-captcha", b"please verify you are a human")),
+    ("DataDome", "", (b"captcha-delivery.com",)),
+    ("AWS WAF", "", (b"awswafintegration",)),
+]
+
+# Markers that only appear on challenge interstitials, whatever the status
+_STRONG_MARKERS = [
+    ("Cloudflare", b"window._cf_chl_opt"),
+    ("PerimeterX", b"_pxcaptcha"),
+    ("DataDome", b"geo.captcha-delivery.com"),
+]
+
+
+def detect_challenge(status_code: int | None, headers: dict[str, str], body: bytes) -> str | None:
+    """Vendor name if the response is a bot challenge / WAF block page, else None."""
+    for vendor, name, needle in _HEADER_SIGNS:
+        value = headers.get(name)
+        if value is not None and needle in value.lower():
+            return vendor
+
+    sniff = body[:SNIFF_BYTES].lower()
+    for vendor, marker in _STRONG_MARKERS:
+        if marker in sniff:
+            return vendor
+
+    blocked = status_code in _BLOCK_STATUSES or (status_code in (202, 405) and b"awswaf" in sniff)
+    if not blocked:
+        return None
+    server = headers.get("server", "").lower()
+    for vendor, server_sign, markers in _BLOCK_PAGE_SIGNS:
+        if server_sign not in server:
+            continue
+        if any(m in sniff for m in markers):
+            return vendor
+    if status_code in _BLOCK_STATUSES and "x-datadome" in headers:
+        return "DataDome"
+    return None
@@ -0,0 +1,53 @@
+"""
+Bounded-cost charset detection for fetched HTML.
+
+Precedence follows the HTML spec's cheap signals only: byte-order mark, then
+the Content-Type charset, then <meta charset> / http-equiv within the first
+SNIFF_BYTES of the body. No statistical detection — when nothing is declared
+we decode as UTF-8 with replacement, so the cost is one linear decode.
+"""
+import codecs
+import re
+
+SNIFF_BYTES = 4096
+DEFAULT_CHARSET = "utf-8"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Browsers treat these labels as windows-1252 (WHATWG Encoding Standard)
+_ALIASES = {"iso-8859-1": "cp1252", "latin1": "cp1252", "latin-1": "cp1252", "us-ascii": "cp1252", "ascii": "cp1252"}
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+# Covers <meta charset="x"> and <meta http-equiv="Content-Type" content="text/html; charset=x">
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+
+def _normalize(label: str | bytes | None) -> str | None:
+    if not label:
+        return None
+    if isinstance(label, bytes):
+        label = label.decode("ascii", errors="ignore")
+    label = label.strip().lower()
+    label = _ALIASES.get(label, label)
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def detect_charset(body: bytes, content_type: str = "") -> str:
+    """Pick the charset for a body from its BOM, Content-Type header or <meta> tag."""
+    for bom, name in _BOMS:
+        if body.startswith(bom):
+            return name
+    if m := _HEADER_CHARSET_RE.search(content_type or ""):
+        if charset := _normalize(m.group(1)):
+            return charset
+    if m := _META_CHARSET_RE.search(body[:SNIFF_BYTES]):
+        if charset := _normalize(m.group(1)):
+            return charset
+    return DEFAULT_CHARSET
+
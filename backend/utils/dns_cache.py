@@ -0,0 +1,111 @@
+"""
+Shared asyncio DNS cache for outbound connections.
+
+Every TCP connection the pooled HTTP client opens, and every TLS probe,
+resolves its host here: once per host per dns_cache_ttl, with concurrent
+lookups for the same host sharing one resolution. Lookups run through
+loop.getaddrinfo on the client loop, so check threads never block in DNS.
+
+getaddrinfo does not expose record TTLs, so the configured TTL is used for
+every host. Expired entries are dropped when looked up, and the cache holds
+at most dns_cache_max_hosts hosts (least recently used evicted first).
+"""
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+
+import httpcore
+
+from core.config import get_settings
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+class DnsCache:
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()  # host -> (expires, addresses)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.lookups = 0
+        self.evictions = 0
+
+    async def resolve(self, host: str) -> list[str]:
+        """IP addresses for host, in getaddrinfo order. Raises OSError (socket.gaierror) on failure."""
+        host = host.lower()
+        if _is_ip(host):
+            return [host.strip("[]")]
+        entry = self._entries.get(host)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(host)
+                return entry[1]
+            del self._entries[host]
+        task = self._inflight.get(host)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup(host))
+            self._inflight[host] = task
+            task.add_done_callback(lambda _: self._inflight.pop(host, None))
+        return await asyncio.shield(task)
+
+    async def _lookup(self, host: str) -> list[str]:
+        self.lookups += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        settings = get_settings()
+        self._entries[host] = (time.monotonic() + settings.dns_cache_ttl, addresses)
+        self._entries.move_to_end(host)
+        while len(self._entries) > settings.dns_cache_max_hosts:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return addresses
+
+    def stats(self) -> dict:
+        total = self.hits + self.lookups
+        return {
+            "hosts": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+dns_cache = DnsCache()
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that resolves through dns_cache, then connects by address."""
+
+    def __init__(self, inner: httpcore.AsyncNetworkBackend):
+        self._inner = inner
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await asyncio.wait_for(dns_cache.resolve(host), timeout)
+        except asyncio.TimeoutError as exc:
+            raise httpcore.ConnectTimeout(f"DNS lookup for {host} timed out") from exc
+        except OSError as exc:
+            raise httpcore.ConnectError(f"DNS lookup for {host} failed: {exc}") from exc
+        last_exc: Exception | None = None
+        # TLS SNI and certificate checks still use the origin host, not the address
+        for address in addresses:
+            try:
+                return await self._inner.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_exc = exc
+        raise last_exc
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._inner.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
@@ -1,11 +1,11 @@
 """
 Email notification utility via Resend REST API.
-Uses httpx (already a dependency) — no extra package needed.
+Sent through the shared pooled HTTP client (utils/http_client.py).
 Only sends if RESEND_API_KEY is configured.
 """
 from html import escape
-import httpx
 from core.config import get_settings
+from utils.http_client import get_http_client, run_sync
 
 
 def send_run_complete_email(
@@ -78,7 +78,7 @@ def send_run_complete_email(
 """
 
     try:
-        resp = httpx.post(
+        resp = run_sync(get_http_client().post(
             "https://api.resend.com/emails",
             headers={"Authorization": f"Bearer {settings.resend_api_key}", "Content-Type": "application/json"},
             json={
@@ -88,7 +88,7 @@ def send_run_complete_email(
                 "html": html,
             },
             timeout=10,
-        )
+        ), timeout=15)
         resp.raise_for_status()
     except Exception:
         pass  # never fail the pipeline due to email
@@ -0,0 +1,138 @@
+"""
+Process-wide pooled HTTP client.
+
+One httpx.AsyncClient lives on a dedicated event-loop thread, so TCP/TLS
+connections and HTTP/2 streams are reused by every Tier 2 check and by the
+email, Slack and webhook notifiers — whichever thread they are called from.
+Started and closed in the FastAPI lifespan; started lazily anywhere else
+(scheduler thread, scripts). Host names are resolved through the shared
+DNS cache (utils/dns_cache.py).
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
+import httpx
+
+from core.config import get_settings
+from utils.dns_cache import CachingNetworkBackend
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_client: httpx.AsyncClient | None = None
+
+
+def _accept_encoding() -> str:
+    """Advertise only the content codings httpx can actually decode here."""
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_client(limits: httpx.Limits | None = None) -> httpx.AsyncClient:
+    settings = get_settings()
+    http2 = settings.http2_enabled and _http2_available()
+    if settings.http2_enabled and not http2:
+        logger.warning("http2_enabled is set but the 'h2' package is missing — using HTTP/1.1")
+    client = httpx.AsyncClient(
+        http2=http2,
+        limits=limits or httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(10.0),
+        headers={
+            "User-Agent": "LaunchProof/1.0",
+            "Accept-Encoding": _accept_encoding(),
+        },
+    )
+    # httpx has no public hook for the network backend — wrap the pool's default one
+    pool = client._transport._pool
+    pool._network_backend = CachingNetworkBackend(pool._network_backend)
+    return client
+
+
+def new_cold_client() -> httpx.AsyncClient:
+    """
+    Throwaway client with no shared or kept-alive connections, configured like
+    the pooled one — for cold-connection timing samples. Close it after use.
+    """
+    return _build_client(httpx.Limits(max_connections=1, max_keepalive_connections=0))
+
+
+def start_http_client() -> None:
+    """Start the client loop thread and create the pooled client. Idempotent."""
+    global _loop, _thread, _client
+    with _lock:
+        if _client is not None:
+            return
+        _loop = asyncio.new_event_loop()
+        _thread = threading.Thread(target=_loop.run_forever, name="http-client-loop", daemon=True)
+        _thread.start()
+        _client = _build_client()
+
+
+def close_http_client() -> None:
+    """Close pooled connections and stop the loop thread."""
+    global _loop, _thread, _client
+    with _lock:
+        if _client is None:
+            return
+        loop, thread, client = _loop, _thread, _client
+        _loop = _thread = _client = None
+    try:
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=10)
+    except Exception as exc:
+        logger.warning("http client close failed: %s", exc)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared client. Only use it from coroutines running on the client loop."""
+    if _client is None:
+        start_http_client()
+    return _client
+
+
+def submit(coro) -> Future:
+    """Schedule a coroutine on the client loop without waiting for it."""
+    if _client is None:
+        start_http_client()
+    return asyncio.run_coroutine_threadsafe(coro, _loop)
+
+
+def run_sync(coro, timeout: float | None = 60):
+    """Run a coroutine on the client loop and block the calling thread for its result."""
+    if _client is None:
+        start_http_client()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the http client loop — await the coroutine instead")
+    future = asyncio.run_coroutine_threadsafe(coro, _loop)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
@@ -0,0 +1,207 @@
+"""
+Single-pass HTML fact extraction for landing pages.
+
+Each page is walked once with the stdlib streaming parser (no tree is
+built, attribute order does not matter) and the handful of facts the
+content checks read are collected:
+
+    title          first <title> outside <svg>, whitespace collapsed
+    meta           lower-cased name / property / http-equiv -> contents, in order
+                   (<meta charset> is stored under "charset")
+    links          each lower-cased rel token -> hrefs
+    script_srcs    external <script src> URLs
+    iframe_srcs    <iframe src> URLs
+    inline_scripts sha256 (first 16 hex chars) of each inline script body
+    forms          action, method and field names of each <form>
+    anchors        href and visible text of each <a href>
+    text           visible text: no script / style / noscript / template / svg
+                   content, nothing under hidden, aria-hidden="true" or an
+                   inline display:none / visibility:hidden style
+
+Parsing stops after MAX_PARSE_CHARS. FetchedPage.facts caches the result
+per page, so every check shares one pass.
+"""
+import hashlib
+from html.parser import HTMLParser
+
+MAX_PARSE_CHARS = 500_000
+MAX_ANCHORS = 1_000
+MAX_FORMS = 50
+_MAX_ANCHOR_TEXT = 200
+
+MAX_TEXT_CHARS = 100_000
+
+_FIELD_TAGS = {"input", "select", "textarea", "button"}
+_INVISIBLE_TAGS = {"script", "style", "noscript", "template", "svg", "title", "iframe", "object"}
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr",
+}
+# Tags that break words apart when rendered
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "button", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "label",
+    "li", "main", "nav", "ol", "option", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+
+
+def _collapse(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _is_hidden(a: dict[str, str]) -> bool:
+    if "hidden" in a or a.get("aria-hidden", "").lower() == "true":
+        return True
+    style = a.get("style", "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+class _FactsParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title: str | None = None
+        self.meta: dict[str, list[str]] = {}
+        self.links: dict[str, list[str]] = {}
+        self.script_srcs: list[str] = []
+        self.iframe_srcs: list[str] = []
+        self.inline_scripts: list[str] = []
+        self.forms: list[dict] = []
+        self.anchors: list[dict] = []
+        self._title_parts: list[str] | None = None
+        self._svg_depth = 0
+        self._in_inline_script = False
+        self._script_parts: list[str] = []
+        self._anchor: dict | None = None
+        self._anchor_parts: list[str] = []
+        self._form: dict | None = None
+        self._text_parts: list[str] = []
+        self._text_chars = 0
+        self._skip_tag: str | None = None  # element whose subtree is not visible
+        self._skip_depth = 0
+
+    def _track_visibility(self, tag: str, a: dict[str, str] | None) -> None:
+        """Follow open/close of the outermost invisible element (a is None for end tags)."""
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1 if a is not None else -1
+                if not self._skip_depth:
+                    self._skip_tag = None
+        elif a is not None and tag not in _VOID_TAGS and (tag in _INVISIBLE_TAGS or _is_hidden(a)):
+            self._skip_tag, self._skip_depth = tag, 1
+        if tag in _BLOCK_TAGS:
+            self._text_parts.append(" ")
+
+    def handle_starttag(self, tag, attrs):
+        a = {name: value or "" for name, value in attrs}
+        self._track_visibility(tag, a)
+        if tag == "svg":
+            self._svg_depth += 1
+        elif tag == "title" and self.title is None and not self._svg_depth:
+            self._title_parts = []
+        elif tag == "meta":
+            self._meta(a)
+        elif tag == "link":
+            for rel in a.get("rel", "").lower().split():
+                self.links.setdefault(rel, []).append(a.get("href", ""))
+        elif tag == "script":
+            if "src" in a:
+                self.script_srcs.append(a["src"])
+            else:
+                self._in_inline_script = True
+                self._script_parts = []
+        elif tag == "iframe" and a.get("src"):
+            self.iframe_srcs.append(a["src"])
+        elif tag == "a" and "href" in a:
+            self._close_anchor()
+            self._anchor = {"href": a["href"], "text": ""}
+            self._anchor_parts = []
+        elif tag == "form":
+            self._close_form()
+            self._form = {"action": a.get("action", ""), "method": (a.get("method") or "get").lower(), "fields": []}
+        elif tag in _FIELD_TAGS and self._form is not None and a.get("name"):
+            self._form["fields"].append(a["name"])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in ("svg", "script"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._track_visibility(tag, None)
+        if tag == "svg" and self._svg_depth:
+            self._svg_depth -= 1
+        elif tag == "title" and self._title_parts is not None:
+            self.title = _collapse("".join(self._title_parts))
+            self._title_parts = None
+        elif tag == "script" and self._in_inline_script:
+            body = "".join(self._script_parts).strip()
+            if body:
+                self.inline_scripts.append(hashlib.sha256(body.encode("utf-8", "replace")).hexdigest()[:16])
+            self._in_inline_script = False
+        elif tag == "a":
+            self._close_anchor()
+        elif tag == "form":
+            self._close_form()
+
+    def handle_data(self, data):
+        if self._in_inline_script:
+            self._script_parts.append(data)
+            return
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._anchor is not None:
+            self._anchor_parts.append(data)
+        if self._skip_tag is None and self._text_chars < MAX_TEXT_CHARS:
+            self._text_parts.append(data)
+            self._text_chars += len(data)
+
+    def _meta(self, a: dict[str, str]) -> None:
+        if "charset" in a:
+            self.meta.setdefault("charset", []).append(a["charset"])
+        for attr in ("name", "property", "http-equiv"):
+            if key := a.get(attr, "").strip().lower():
+                self.meta.setdefault(key, []).append(a.get("content", ""))
+
+    def _close_anchor(self) -> None:
+        if self._anchor is None:
+            return
+        if len(self.anchors) < MAX_ANCHORS:
+            self._anchor["text"] = _collapse("".join(self._anchor_parts))[:_MAX_ANCHOR_TEXT]
+            self.anchors.append(self._anchor)
+        self._anchor = None
+
+    def _close_form(self) -> None:
+        if self._form is None:
+            return
+        if len(self.forms) < MAX_FORMS:
+            self._form["fields"] = tuple(self._form["fields"])
+            self.forms.append(self._form)
+        self._form = None
+
+    def finish(self) -> None:
+        if self._title_parts is not None:  # unclosed <title>
+            self.title = _collapse("".join(self._title_parts))
+        self._close_anchor()
+        self._close_form()
+
+
+def extract_facts(html: str) -> dict:
+    """Walk html once and return the PageFacts fields (see core.models.PageFacts)."""
+    parser = _FactsParser()
+    try:
+        parser.feed(html[:MAX_PARSE_CHARS])
+        parser.close()
+    except Exception:
+        pass  # keep whatever was collected before the markup broke the parser
+    parser.finish()
+    return {
+        "title": parser.title or "",
+        "meta": {k: tuple(v) for k, v in parser.meta.items()},
+        "links": {k: tuple(v) for k, v in parser.links.items()},
+        "script_srcs": tuple(parser.script_srcs),
+        "iframe_srcs": tuple(parser.iframe_srcs),
+        "inline_scripts": tuple(parser.inline_scripts),
+        "forms": tuple(parser.forms),
+        "anchors": tuple(parser.anchors),
+        "text": _collapse("".join(parser._text_parts))[:MAX_TEXT_CHARS],
+        "truncated": len(html) > MAX_PARSE_CHARS,
+    }
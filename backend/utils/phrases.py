@@ -0,0 +1,81 @@
+"""
+Tokenized phrase matching over visible page text and ad copy.
+
+Text is split into lower-cased tokens: runs of letters/digits, plus "$" and
+"%" as tokens of their own ("make $500 a day" -> make $ 500 a day). A phrase
+is a space-separated token sequence; a token may list alternatives with "|"
+("instant result|results"), and "#" matches any number.
+
+All phrases are compiled into one token trie. Matching walks the tokens once,
+carrying the set of trie nodes reached so far, so run time is linear in the
+text length for a given phrase set — there is no backtracking, unlike a
+regex with unbounded gaps.
+"""
+import re
+
+_TOKEN_RE = re.compile(r"[^\W_]+|[$%]")
+_NUMBER = "#"
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _Node:
+    __slots__ = ("children", "labels")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.labels: list[tuple[str, int]] = []  # (label, phrase length in tokens)
+
+
+class PhraseMatcher:
+    def __init__(self, phrases: dict[str, list[str]]):
+        """phrases: label -> phrase patterns (see module docstring)."""
+        self._root = _Node()
+        for label, patterns in phrases.items():
+            for pattern in patterns:
+                self._add(label, [alt.split("|") for alt in pattern.lower().split()])
+
+    def _add(self, label: str, steps: list[list[str]]) -> None:
+        nodes = [self._root]
+        for alternatives in steps:
+            nodes = [node.children.setdefault(token, _Node()) for node in nodes for token in alternatives]
+        for node in nodes:
+            node.labels.append((label, len(steps)))
+
+    def matches(self, tokens: list[str]) -> list[tuple[str, int, str]]:
+        """(label, token offset, matched text) for every phrase occurrence, in order of end position."""
+        found = []
+        active: list[_Node] = []
+        for i, token in enumerate(tokens):
+            advanced = []
+            for node in (*active, self._root):
+                if child := node.children.get(token):
+                    advanced.append(child)
+                if token.isdigit() and (child := node.children.get(_NUMBER)):
+                    advanced.append(child)
+            for node in advanced:
+                for label, length in node.labels:
+                    start = i - length + 1
+                    found.append((label, start, " ".join(tokens[start:i + 1])))
+            active = advanced
+        return found
+
+    def first(self, tokens: list[str]) -> dict[str, str]:
+        """{label: first matched text} for each label that occurs."""
+        result: dict[str, str] = {}
+        for label, _, text in self.matches(tokens):
+            result.setdefault(label, text)
+        return result
+
+
+def near(tokens: list[str], first: str, second: str, window: int) -> bool:
+    """Whether `second` occurs within `window` tokens after `first`. One pass."""
+    last_first = None
+    for i, token in enumerate(tokens):
+        if token == first:
+            last_first = i
+        elif token == second and last_first is not None and i - last_first <= window:
+            return True
+    return False
@@ -0,0 +1,239 @@
+"""
+Data-driven tracking signature catalog and single-pass multi-signature scanner.
+
+Pixel, GTM, conversion-event and cookie-consent signatures live in a
+versioned JSON file (signatures.json next to this module, or
+signature_catalog_path). Each entry names a platform (or null), vendor, kind
+("pixel", "conversion", "gtm", "consent", "analytics") and its patterns
+and/or vendor domains; patterns are case-sensitive unless the entry sets
+"case_sensitive": false. Domains feed the per-page vendor inventory of
+script / iframe origins (utils/vendors.py), which checks consult before
+falling back to the body scan.
+
+Every pattern is compiled into one Aho-Corasick automaton (pyahocorasick)
+over lower-cased text. A page body is scanned once, without decoding, in
+fixed-size lower-cased windows, and every hit comes back with its byte
+offset (FetchedPage.signature_hits caches the result per page, with the
+catalog version that produced it). The automaton reports every occurrence,
+overlapping ones included, in time linear in the body size plus the number
+of hits, however many patterns the catalog holds. Case-sensitive patterns
+are re-checked against the original bytes. At most MAX_HITS_PER_PATTERN
+hits are kept per pattern.
+
+The file is re-checked at most every signature_reload_interval seconds.
+When it changed, the new catalog is compiled on the side and swapped in
+with a single assignment; a file that fails to load or compile is logged
+and the running catalog is kept.
+"""
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+import ahocorasick
+
+from core.config import get_settings
+from utils.vendors import DomainTrie, VendorInventory, build_inventory
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_CATALOG = Path(__file__).with_name("signatures.json")
+KINDS = ("pixel", "conversion", "gtm", "consent", "analytics")
+MAX_HITS_PER_PATTERN = 50
+_SCAN_WINDOW = 64 * 1024  # bytes lower-cased at a time
+
+
+class SignatureHits:
+    """
+    Every hit of one scan, in offset order, as (offset, kind, platform, vendor, pattern).
+    version is the catalog version that produced them.
+    """
+
+    def __init__(self, hits: list[tuple[int, str, str | None, str, str]], version: str):
+        self.hits = tuple(sorted(hits, key=lambda h: h[0]))
+        self.version = version
+
+    def of(self, kind: str, platform: str | None = None) -> list[tuple[int, str, str | None, str, str]]:
+        return [h for h in self.hits if h[1] == kind and (platform is None or h[2] == platform)]
+
+    def found(self, kind: str, platform: str | None = None) -> bool:
+        return bool(self.of(kind, platform))
+
+    def vendors(self, kind: str) -> list[str]:
+        """Distinct vendors hit for a kind, in order of first appearance."""
+        return list(dict.fromkeys(h[3] for h in self.of(kind)))
+
+
+class SignatureScanner:
+    def __init__(self, entries: list[dict]):
+        # lower-cased pattern -> [(kind, platform, vendor, pattern, exact bytes or None if case-insensitive)]
+        labels: dict[str, list[tuple[str, str | None, str, str, bytes | None]]] = {}
+        for entry in entries:
+            for pattern in entry.get("patterns", ()):
+                exact = pattern.encode() if entry.get("case_sensitive", True) else None
+                labels.setdefault(pattern.lower(), []).append(
+                    (entry["kind"], entry.get("platform"), entry["vendor"], pattern, exact)
+                )
+        self._automaton = ahocorasick.Automaton()
+        for key, key_labels in labels.items():
+            self._automaton.add_word(key, (len(key), key_labels))
+        self._automaton.make_automaton()
+        self._overlap = max((len(k) for k in labels), default=1) - 1
+
+    def scan(self, body: bytes) -> list[tuple[int, str, str | None, str, str]]:
+        if not len(self._automaton):
+            return []
+        hits = []
+        counts: dict[tuple, int] = {}  # (kind, vendor, pattern) -> hits kept
+        for window in range(0, len(body), _SCAN_WINDOW):
+            # Patterns are ASCII, so latin-1 maps bytes to characters one to one (offsets stay byte offsets).
+            # The window overlaps the next by the longest pattern; only hits starting in it count here.
+            text = body[window:window + _SCAN_WINDOW + self._overlap].lower().decode("latin-1")
+            for end, (length, key_labels) in self._automaton.iter(text):
+                start = end - length + 1
+                if start >= _SCAN_WINDOW:
+                    continue
+                start += window
+                for kind, platform, vendor, pattern, exact in key_labels:
+                    if exact is not None and not body.startswith(exact, start):
+                        continue
+                    label = (kind, vendor, pattern)
+                    if counts.get(label, 0) < MAX_HITS_PER_PATTERN:
+                        counts[label] = counts.get(label, 0) + 1
+                        hits.append((start, kind, platform, vendor, pattern))
+        return hits
+
+
+def _validate(data: dict) -> list[dict]:
+    if not isinstance(data.get("version"), str) or not data["version"]:
+        raise ValueError("catalog has no version")
+    entries = data.get("signatures")
+    if not isinstance(entries, list):
+        raise ValueError("catalog has no signatures list")
+    for i, entry in enumerate(entries):
+        if entry.get("kind") not in KINDS:
+            raise ValueError(f"signature {i}: unknown kind {entry.get('kind')!r}")
+        if not entry.get("vendor"):
+            raise ValueError(f"signature {i}: missing vendor")
+        patterns = entry.get("patterns", [])
+        domains = entry.get("domains", [])
+        if not patterns and not domains:
+            raise ValueError(f"signature {i}: needs patterns or domains")
+        if not all(isinstance(p, str) and p.isascii() and p for p in patterns):
+            raise ValueError(f"signature {i}: patterns must be non-empty ASCII strings")
+        if not all(isinstance(d, str) and d.isascii() and d and "://" not in d for d in domains):
+            raise ValueError(f"signature {i}: domains must be ASCII host[/path] strings")
+    return entries
+
+
+class SignatureCatalog:
+    """One immutable load of the catalog file, with its compiled scanner and domain trie."""
+
+    def __init__(self, data: dict, file_signature: tuple = ()):
+        self.entries = _validate(data)
+        self.version = data["version"]
+        self.file_signature = file_signature
+        self.loaded_at = time.time()
+        self._scanner = SignatureScanner(self.entries)
+        self._domains = DomainTrie()
+        for entry in self.entries:
+            for domain in entry.get("domains", ()):
+                self._domains.add(domain, (entry["kind"], entry.get("platform"), entry["vendor"]))
+
+    def patterns(self, kind: str, platform: str | None = None) -> list[str]:
+        """Every pattern of a kind (for one platform), in catalog order."""
+        return [
+            p for e in self.entries
+            if e["kind"] == kind and (platform is None or e.get("platform") == platform)
+            for p in e.get("patterns", ())
+        ]
+
+    def vendors(self, kind: str) -> list[str]:
+        return list(dict.fromkeys(e["vendor"] for e in self.entries if e["kind"] == kind))
+
+    def scan(self, body: bytes) -> SignatureHits:
+        return SignatureHits(self._scanner.scan(body), self.version)
+
+    def inventory(self, facts, base_url: str) -> VendorInventory:
+        """Classify a page's script / iframe / preconnect origins (facts: core.models.PageFacts)."""
+        return build_inventory(self._domains, facts, base_url, self.version)
+
+
+class CatalogLoader:
+    def __init__(self):
+        self._catalog: SignatureCatalog | None = None
+        self._reload_lock = threading.Lock()
+        self._checked_at = 0.0
+        self.reloads = 0
+        self.failures = 0
+
+    @staticmethod
+    def _path() -> Path:
+        return Path(get_settings().signature_catalog_path or BUNDLED_CATALOG)
+
+    def current(self) -> SignatureCatalog:
+        """The live catalog, re-checking the file first if the reload interval passed."""
+        if self._catalog is None:
+            with self._reload_lock:
+                if self._catalog is None:
+                    self._catalog = self._initial()
+                    self._checked_at = time.monotonic()
+        else:
+            self.maybe_reload()
+        return self._catalog
+
+    def _initial(self) -> SignatureCatalog:
+        path = self._path()
+        try:
+            return self._load(path)
+        except Exception as exc:
+            if path == BUNDLED_CATALOG:
+                raise
+            self.failures += 1
+            logger.warning("Signature catalog %s unusable (%s) — using the bundled catalog", path, exc)
+            return self._load(BUNDLED_CATALOG)
+
+    @staticmethod
+    def _load(path: Path) -> SignatureCatalog:
+        stat = path.stat()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return SignatureCatalog(data, (str(path), stat.st_mtime_ns, stat.st_size))
+
+    def maybe_reload(self) -> None:
+        """Swap in a recompiled catalog if the file changed. Cheap when called often."""
+        if time.monotonic() - self._checked_at < get_settings().signature_reload_interval:
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return  # another thread is already checking; keep serving the current catalog
+        try:
+            self._checked_at = time.monotonic()
+            path = self._path()
+            stat = path.stat()
+            if (str(path), stat.st_mtime_ns, stat.st_size) != self._catalog.file_signature:
+                catalog = self._load(path)
+                self._catalog = catalog  # atomic swap
+                self.reloads += 1
+                logger.info("Signature catalog %s loaded from %s", catalog.version, path)
+        except Exception as exc:
+            self.failures += 1
+            logger.warning("Signature catalog reload skipped: %s", exc)
+        finally:
+            self._reload_lock.release()
+
+    def stats(self) -> dict:
+        catalog = self._catalog
+        return {
+            "version": catalog.version if catalog else None,
+            "signatures": len(catalog.entries) if catalog else 0,
+            "loaded_at": catalog.loaded_at if catalog else None,
+            "reloads": self.reloads,
+            "failures": self.failures,
+        }
+
+
+catalog_loader = CatalogLoader()
+
+
+def signature_catalog() -> SignatureCatalog:
+    return catalog_loader.current()
@@ -1,9 +1,9 @@
 """
 Slack webhook notification utility.
 Sends a concise run-complete message to a user-configured Slack incoming webhook.
-Uses httpx (already a dependency) — no extra package needed.
+Sent through the shared pooled HTTP client (utils/http_client.py).
 """
-import httpx
+from utils.http_client import get_http_client, run_sync
 
 
 def send_slack_notification(webhook_url: str, run_name: str, score: float, run_url: str) -> None:
@@ -46,7 +46,7 @@ def send_slack_notification(webhook_url: str, run_name: str, score: float, run_u
     }
 
     try:
-        resp = httpx.post(webhook_url, json=payload, timeout=8)
+        resp = run_sync(get_http_client().post(webhook_url, json=payload, timeout=8), timeout=10)
         resp.raise_for_status()
     except Exception:
         pass  # never fail the pipeline due to Slack
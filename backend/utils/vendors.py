@@ -0,0 +1,123 @@
+"""
+Third-party vendor inventory of a landing page, classified by origin.
+
+Every <script src>, <iframe src> and <link rel=preconnect> URL of a page
+(from PageFacts) is resolved against the page URL and its host looked up in
+a suffix trie of known vendor domains. The trie is keyed by reversed host
+labels, so "connect.facebook.net" is found by walking net -> facebook ->
+connect and any subdomain of a listed domain matches too. Lookup cost
+depends on the number of labels in the host, not on the number of domains
+or the page size.
+
+A domain may carry a path prefix ("googletagmanager.com/gtm.js") so that
+only the vendor's tag counts, not everything else served from its host (the
+Facebook SDK shares connect.facebook.net with the pixel). "*" in a path
+prefix matches one path segment ("connect.facebook.net/*/fbevents.js"). The
+deepest matching host wins, then the longest matching path prefix.
+
+The domains come from the signature catalog entries' "domains" lists
+(utils/signatures.py); FetchedPage.vendor_inventory caches the result per page.
+"""
+import re
+from urllib.parse import urljoin, urlsplit
+
+# Where an origin was referenced; only loaded resources count as evidence
+LOADED_SOURCES = ("script", "iframe")
+_ENTRIES = ""  # trie key holding a node's entries (host labels are never empty)
+
+VendorLabel = tuple[str, str | None, str]  # (kind, platform, vendor)
+
+
+class DomainTrie:
+    def __init__(self):
+        self._root: dict = {}
+
+    def add(self, domain: str, label: VendorLabel) -> None:
+        host, _, path = domain.lower().partition("/")
+        node = self._root
+        for part in reversed(host.split(".")):
+            node = node.setdefault(part, {})
+        entries = node.setdefault(_ENTRIES, [])
+        prefix = "/" + path if path else ""
+        entries.append((prefix, re.compile("[^/]*".join(re.escape(p) for p in prefix.split("*"))), label))
+        entries.sort(key=lambda e: len(e[0]), reverse=True)
+
+    def lookup(self, host: str, path: str = "/") -> VendorLabel | None:
+        """The label of the most specific domain covering host (and path), or None."""
+        path = path.lower()
+        matched = []
+        node = self._root
+        for part in reversed(host.lower().rstrip(".").split(".")):
+            node = node.get(part)
+            if node is None:
+                break
+            if _ENTRIES in node:
+                matched.append(node[_ENTRIES])
+        for entries in reversed(matched):
+            for _, prefix, label in entries:
+                if prefix.match(path):
+                    return label
+        return None
+
+
+class VendorInventory:
+    """
+    Classified third-party references of one page (scripts, then iframes, then preconnect hints) as
+    (source, host, kind, platform, vendor). source is "script", "iframe" or "preconnect".
+    """
+
+    def __init__(self, entries: list[tuple[str, str, str, str | None, str]], version: str):
+        self.entries = tuple(entries)
+        self.version = version
+
+    def of(self, kind: str, platform: str | None = None) -> list[tuple[str, str, str, str | None, str]]:
+        """Loaded resources (scripts, iframes) of a kind; preconnect hints alone are not evidence."""
+        return [
+            e for e in self.entries
+            if e[0] in LOADED_SOURCES and e[2] == kind and (platform is None or e[3] == platform)
+        ]
+
+    def found(self, kind: str, platform: str | None = None) -> bool:
+        return bool(self.of(kind, platform))
+
+    def vendors(self, kind: str) -> list[str]:
+        """Distinct vendors loaded for a kind, in order of first appearance."""
+        return list(dict.fromkeys(e[4] for e in self.of(kind)))
+
+    def summary(self) -> dict[str, list[str]]:
+        """{kind: vendors} of loaded resources, plus "preconnect" for vendors only hinted at."""
+        loaded: dict[str, list[str]] = {}
+        for source, _, kind, _, vendor in self.entries:
+            if source in LOADED_SOURCES and vendor not in loaded.setdefault(kind, []):
+                loaded[kind].append(vendor)
+        seen = {v for vendors in loaded.values() for v in vendors}
+        hinted = list(dict.fromkeys(e[4] for e in self.entries if e[0] == "preconnect" and e[4] not in seen))
+        if hinted:
+            loaded["preconnect"] = hinted
+        return loaded
+
+
+def page_origins(facts, base_url: str) -> list[tuple[str, str, str]]:
+    """(source, host, path) for every absolute http(s) script, iframe and preconnect URL."""
+    refs = [
+        *(("script", src) for src in facts.script_srcs),
+        *(("iframe", src) for src in facts.iframe_srcs),
+        *(("preconnect", href) for href in facts.links.get("preconnect", ())),
+    ]
+    origins = []
+    for source, ref in refs:
+        try:
+            parts = urlsplit(urljoin(base_url, ref.strip()))
+        except ValueError:
+            continue
+        if parts.scheme in ("http", "https") and parts.hostname:
+            origins.append((source, parts.hostname, parts.path or "/"))
+    return origins
+
+
+def build_inventory(trie: DomainTrie, facts, base_url: str, version: str) -> VendorInventory:
+    entries = []
+    for source, host, path in page_origins(facts, base_url):
+        if label := trie.lookup(host, path):
+            entries.append((source, host, *label))
+    return VendorInventory(entries, version)
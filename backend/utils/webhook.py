@@ -5,9 +5,10 @@ POSTs a JSON payload to a user-configured URL when a QA run completes.
 Compatible with n8n, Zapier, Make, custom webhook endpoints, and any HTTP server.
 Silently no-ops on any failure — never blocks the pipeline.
 """
-import httpx
 from datetime import datetime, timezone
 
+from utils.http_client import get_http_client, run_sync
+
 
 def send_webhook_notification(
     webhook_url: str,
@@ -54,7 +55,7 @@ def send_webhook_notification(
     }
 
     try:
-        resp = httpx.post(
+        resp = run_sync(get_http_client().post(
             webhook_url,
             json=payload,
             timeout=10,
@@ -63,7 +64,7 @@ def send_webhook_notification(
                 "User-Agent": "LaunchProof-Webhook/1.0",
                 "X-LaunchProof-Event": "run.completed",
             },
-        )
+        ), timeout=15)
         resp.raise_for_status()
     except Exception:
         pass  # never fail the pipeline due to webhook delivery
@@ -60,6 +60,7 @@ const CHECKS: CheckSpec[] = [
   { id: 'landing_page_title', name: 'Landing Page Title', category: 'URL', severity: 'critical', tier: 2, platforms: ['universal'], description: 'Fails if page title is 404, error, or empty — indicates broken destination.' },
   { id: 'page_load_time', name: 'Page Load Time', category: 'URL', severity: 'major', tier: 2, platforms: ['universal'], description: 'Warns >2s, fails >4s — every second of delay loses ~7% of conversions.' },
   { id: 'mobile_readiness', name: 'Mobile Readiness', category: 'URL', severity: 'major', tier: 2, platforms: ['universal'], description: 'Checks for viewport meta tag — 60-80% of paid social traffic is mobile.' },
+  { id: 'robots_ad_crawler_allowed', name: 'Ad Crawler Allowed by robots.txt', category: 'URL', severity: 'major', tier: 2, platforms: ['meta', 'google', 'linkedin'], description: "Fails if robots.txt blocks the platform's ad crawler (AdsBot-Google, facebookexternalhit, LinkedInBot)." },
   { id: 'security_headers', name: 'HTTP Security Headers', category: 'URL', severity: 'minor', tier: 2, platforms: ['universal'], description: 'Checks for HSTS, X-Content-Type-Options, X-Frame-Options.' },
   // ── Content — Tier 2 ────────────────────────────────────────────────────────
   { id: 'og_tags_present', name: 'Open Graph Tags', category: 'Content', severity: 'minor', tier: 2, platforms: ['universal'], description: 'og:title and og:image present — affects how shared links look on social.' },